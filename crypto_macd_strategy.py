@@ -1,8 +1,251 @@
+import os
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from binance.client import Client
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')  # Charts are only saved to disk
+from matplotlib.figure import Figure
+from scipy.signal import lfilter
+
+# Optional JIT compilation (falls back to SciPy/NumPy implementations)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels still run as plain Python"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _macd_kernel(src, a_fast, a_slow, a_sig):
+    """
+    Single-pass MACD: fast/slow EMAs, MACD line, signal line, histogram and
+    bullish crossover (MACD crosses above Signal while both are below zero)
+    """
+    n = src.shape[0]
+    # Outputs follow the input precision (float32 prices give float32 indicators)
+    macd = np.empty_like(src)
+    signal = np.empty_like(src)
+    hist = np.empty_like(src)
+    cross = np.empty(n, dtype=np.bool_)
+    if n == 0:
+        return macd, signal, hist, cross
+    
+    # Seed with the first sample, matching pandas ewm(adjust=False)
+    ef = src[0]
+    es = src[0]
+    sg = 0.0
+    prev_macd = 0.0
+    prev_signal = 0.0
+    for i in range(n):
+        ef = a_fast * src[i] + (1 - a_fast) * ef
+        es = a_slow * src[i] + (1 - a_slow) * es
+        macd_i = ef - es
+        sg = a_sig * macd_i + (1 - a_sig) * sg
+        macd[i] = macd_i
+        signal[i] = sg
+        hist[i] = macd_i - sg
+        # No previous bar on the first sample, so it can never be a crossover
+        cross[i] = (i > 0 and macd_i > sg and prev_macd <= prev_signal
+                    and macd_i < 0 and sg < 0)
+        prev_macd = macd_i
+        prev_signal = sg
+    return macd, signal, hist, cross
+
+
+def _ema_alpha(span):
+    """EMA smoothing factor for a given span"""
+    return 2.0 / (span + 1)
+
+
+# Smoothing factor per MA type; unknown types use EMA until others are implemented
+_MA_ALPHA = {'EMA': _ema_alpha}
+
+
+def _ema_lfilter(x, alpha):
+    """EMA as an IIR filter, seeded with the first sample like pandas ewm(adjust=False)"""
+    if len(x) == 0:
+        return x.copy()
+    # Coefficients in the input dtype keep lfilter from upcasting float32 data
+    b = np.array([alpha], dtype=x.dtype)
+    a = np.array([1.0, alpha - 1.0], dtype=x.dtype)
+    return lfilter(b, a, x, zi=(1 - alpha) * x[:1])[0]
+
+
+def _macd_lfilter(src, a_fast, a_slow, a_sig):
+    """SciPy equivalent of _macd_kernel for environments without Numba"""
+    macd = _ema_lfilter(src, a_fast) - _ema_lfilter(src, a_slow)
+    signal = _ema_lfilter(macd, a_sig)
+    hist = macd - signal
+    
+    cross = np.zeros(len(src), dtype=np.bool_)
+    cross[1:] = (
+        (macd[1:] > signal[1:]) &
+        (macd[:-1] <= signal[:-1]) &
+        (macd[1:] < 0) &
+        (signal[1:] < 0)
+    )
+    return macd, signal, hist, cross
+
+
+# Exit reason codes written by the backtest kernel
+EXIT_REASONS = ('Take Profit', 'Stop Loss', 'End of Period')
+
+
+@njit(cache=True)
+def _run_backtest(close, cross, tp, sl):
+    """
+    Long-only TP/SL backtest over raw arrays
+    
+    Returns preallocated (entry_idx, exit_idx, entry_px, exit_px, ret, reason)
+    arrays plus the number of trades written to them. Reason codes index
+    into EXIT_REASONS.
+    """
+    n = close.shape[0]
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    entry_px = np.empty(n)
+    exit_px = np.empty(n)
+    ret = np.empty(n)
+    reason = np.empty(n, dtype=np.uint8)
+    
+    count = 0
+    position = False
+    entry_i = 0
+    entry_price = 0.0
+    for i in range(n):
+        if not position:
+            if cross[i]:
+                position = True
+                entry_i = i
+                entry_price = close[i]
+        else:
+            returns = (close[i] - entry_price) / entry_price
+            if returns >= tp:
+                code = 0
+            elif returns <= -sl:
+                code = 1
+            else:
+                continue
+            entry_idx[count] = entry_i
+            exit_idx[count] = i
+            entry_px[count] = entry_price
+            exit_px[count] = close[i]
+            ret[count] = returns
+            reason[count] = code
+            count += 1
+            position = False
+    
+    # Close any open position at the end
+    if position:
+        entry_idx[count] = entry_i
+        exit_idx[count] = n - 1
+        entry_px[count] = entry_price
+        exit_px[count] = close[n - 1]
+        ret[count] = (close[n - 1] - entry_price) / entry_price
+        reason[count] = 2
+        count += 1
+    
+    return entry_idx, exit_idx, entry_px, exit_px, ret, reason, count
+
+
+# Above this fraction of signal bars the compiled loop beats per-entry NumPy scans
+SPARSE_SIGNAL_DENSITY = 0.05
+
+
+def _resolve_trades(close, cross, tp, sl):
+    """
+    Vectorized equivalent of _run_backtest for sparse signals
+    
+    Walks entry signals instead of bars: for each entry the first TP/SL hit
+    is found with NumPy comparisons over growing windows of the remaining
+    prices, and entries inside an open trade are skipped via searchsorted.
+    """
+    n = close.shape[0]
+    entries = np.flatnonzero(cross)
+    m = entries.size
+    entry_idx = np.empty(m, dtype=np.int64)
+    exit_idx = np.empty(m, dtype=np.int64)
+    entry_px = np.empty(m)
+    exit_px = np.empty(m)
+    ret = np.empty(m)
+    reason = np.empty(m, dtype=np.uint8)
+    
+    count = 0
+    k = 0
+    while k < m:
+        entry_i = entries[k]
+        entry_price = float(close[entry_i])
+        exit_i = n - 1
+        code = 2
+        
+        start = entry_i + 1
+        width = 64
+        while start < n:
+            # Returns in float64 regardless of price precision, like _run_backtest
+            returns = (close[start:start + width].astype(np.float64) - entry_price) / entry_price
+            tp_hit = returns >= tp
+            hit = tp_hit | (returns <= -sl)
+            if hit.any():
+                j = int(np.argmax(hit))
+                exit_i = start + j
+                code = 0 if tp_hit[j] else 1
+                break
+            start += width
+            width *= 2
+        
+        entry_idx[count] = entry_i
+        exit_idx[count] = exit_i
+        entry_px[count] = entry_price
+        exit_price = float(close[exit_i])
+        exit_px[count] = exit_price
+        ret[count] = (exit_price - entry_price) / entry_price
+        reason[count] = code
+        count += 1
+        
+        # Next entry must come after this trade's exit bar
+        k = int(np.searchsorted(entries, exit_i, side='right'))
+    
+    return entry_idx, exit_idx, entry_px, exit_px, ret, reason, count
+
+
+@njit(parallel=True, cache=True)
+def _sweep(src, close, a_fasts, a_slows, a_sigs, tp, sl):
+    """
+    Backtest every (fast, slow, signal) smoothing-factor combination in parallel
+    
+    Returns (total_return, win_rate, n_trades) arrays, one entry per combination.
+    Each iteration works on its own scratch arrays, so combinations are independent.
+    """
+    n_combos = a_fasts.shape[0]
+    total_return = np.zeros(n_combos)
+    win_rate = np.zeros(n_combos)
+    n_trades = np.zeros(n_combos, dtype=np.int64)
+    for c in prange(n_combos):
+        cross = _macd_kernel(src, a_fasts[c], a_slows[c], a_sigs[c])[3]
+        ret, _, count = _run_backtest(close, cross, tp, sl)[4:]
+        if count == 0:
+            continue
+        total = 0.0
+        wins = 0
+        for t in range(count):
+            total += ret[t]
+            if ret[t] > 0:
+                wins += 1
+        total_return[c] = total * 100
+        win_rate[c] = wins / count * 100
+        n_trades[c] = count
+    return total_return, win_rate, n_trades
+
 
 class CryptoMACDTradingStrategy:
     """
@@ -12,7 +255,16 @@ class CryptoMACDTradingStrategy:
     - Supports any timeframe including 5-minute intervals
     """
     
-    def __init__(self, symbol, days_back=30, interval='5m', fast_length=12, slow_length=26, signal_smoothing=9, source='close', oscillator_ma_type='EMA', signal_line_ma_type='EMA'):
+    # Shared Binance client, created on first use
+    _client = None
+    
+    @classmethod
+    def _get_client(cls):
+        """Return the shared Binance client so its HTTP session is reused"""
+        cls._client = cls._client or Client()
+        return cls._client
+    
+    def __init__(self, symbol, days_back=30, interval='5m', fast_length=12, slow_length=26, signal_smoothing=9, source='close', oscillator_ma_type='EMA', signal_line_ma_type='EMA', cache_dir='kline_cache'):
         """
         Initialize the strategy with parameters matching TradingView MACD settings
         
@@ -26,6 +278,7 @@ class CryptoMACDTradingStrategy:
         - source: Price source (default 'close') - matches "Source"
         - oscillator_ma_type: MA type for MACD calculation (default 'EMA') - matches "Oscillator MA Type"
         - signal_line_ma_type: MA type for Signal line (default 'EMA') - matches "Signal Line MA Type"
+        - cache_dir: Directory for cached klines (default 'kline_cache'), None disables caching
         """
         self.symbol = symbol
         self.days_back = days_back
@@ -44,168 +297,194 @@ class CryptoMACDTradingStrategy:
         self.take_profit = 0.02  # 2%
         self.stop_loss = 0.01    # 1%
         self.data = None
-        self.trades = []
+        self.cache_dir = cache_dir
         
-        # Initialize Binance client (public API, no authentication needed for historical data)
-        self.client = Client()
+        # Trades are stored column-wise (one array per field); see the trades property
+        self._entry_idx = np.empty(0, dtype=np.int64)
+        self._exit_idx = np.empty(0, dtype=np.int64)
+        self._entry_px = np.empty(0, dtype=np.float64)
+        self._exit_px = np.empty(0, dtype=np.float64)
+        self._ret = np.empty(0, dtype=np.float64)
+        self._reason = np.empty(0, dtype=np.uint8)  # Index into EXIT_REASONS
+        self._trades = []
         
+        # Initialize Binance client (public API, no authentication needed for historical data)
+        self.client = self._get_client()
+        
+    @staticmethod
+    def _klines_to_frame(klines):
+        """Convert raw Binance klines to an OHLCV DataFrame indexed by open time"""
+        # Parse only open time + OHLCV straight into one float64 buffer
+        # (float64 keeps millisecond timestamps exact)
+        arr = np.fromiter(
+            (float(k[j]) for k in klines for j in (0, 1, 2, 3, 4, 5)),
+            dtype=np.float64,
+            count=len(klines) * 6
+        ).reshape(-1, 6)
+        
+        # Prices carry ~6 significant digits, so float32 halves memory traffic
+        # for the indicator and backtest passes at no practical cost
+        ohlcv = arr[:, 1:].astype(np.float32)
+        return pd.DataFrame(
+            {
+                'Open': ohlcv[:, 0],
+                'High': ohlcv[:, 1],
+                'Low': ohlcv[:, 2],
+                'Close': ohlcv[:, 3],
+                'Volume': ohlcv[:, 4]
+            },
+            index=pd.DatetimeIndex(
+                pd.to_datetime(arr[:, 0].astype('int64'), unit='ms'), name='timestamp'
+            )
+        )
+    
+    def _cache_path(self):
+        """Location of the cached klines for this symbol/interval"""
+        return os.path.join(self.cache_dir, f"{self.symbol}_{self.interval}.parquet")
+    
+    def _load_cache(self):
+        """Load cached klines, or None if caching is disabled or nothing is cached"""
+        if self.cache_dir is None or not os.path.exists(self._cache_path()):
+            return None
+        try:
+            return pd.read_parquet(self._cache_path())
+        except Exception as e:
+            print(f"Warning: Could not read kline cache {self._cache_path()}. Error: {e}")
+            return None
+    
+    def _save_cache(self, df):
+        """Persist klines so later runs only fetch the new tail"""
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_parquet(self._cache_path(), compression='zstd')
+        except Exception as e:
+            print(f"Warning: Could not write kline cache {self._cache_path()}. Error: {e}")
+    
     def fetch_data(self):
-        """Fetch historical price data from Binance"""
+        """Fetch historical price data from Binance, reusing cached klines when possible"""
         try:
             # Calculate start time
             start_time = datetime.now() - timedelta(days=self.days_back)
             start_str = start_time.strftime('%Y-%m-%d')
             
-            # Fetch kline data
-            klines = self.client.get_historical_klines(
-                self.symbol, 
-                self.interval, 
-                start_str
-            )
-            
-            if not klines:
-                raise ValueError(f"No data found for {self.symbol}")
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            
-            # Convert timestamp and set as index
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            
-            # Convert price columns to float
-            price_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in price_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            cached = self._load_cache()
+            if cached is not None and not cached.empty and cached.index[0] <= pd.Timestamp(start_str):
+                # Refetch from the last cached candle, which may still have been open when cached
+                last_ms = cached.index[-1].value // 10**6
+                klines = self.client.get_historical_klines(
+                    self.symbol,
+                    self.interval,
+                    last_ms
+                )
+                df = pd.concat([cached, self._klines_to_frame(klines)])
+                df = df[~df.index.duplicated(keep='last')]
+            else:
+                klines = self.client.get_historical_klines(
+                    self.symbol, 
+                    self.interval, 
+                    start_str
+                )
+                
+                if not klines:
+                    raise ValueError(f"No data found for {self.symbol}")
+                
+                df = self._klines_to_frame(klines)
             
-            # Rename columns to match original format
-            df.rename(columns={
-                'open': 'Open',
-                'high': 'High', 
-                'low': 'Low',
-                'close': 'Close',
-                'volume': 'Volume'
-            }, inplace=True)
+            self._save_cache(df)
             
-            self.data = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+            self.data = df.loc[pd.Timestamp(start_str):].copy()
             print(f"Fetched {len(self.data)} {self.interval} candles for {self.symbol}")
             return self.data
             
         except Exception as e:
             raise ValueError(f"Error fetching data for {self.symbol}: {str(e)}")
     
-    def calculate_macd(self):
-        """Calculate MACD, Signal line, and Histogram using TradingView settings"""
-        # Get the source price (Close, High, Low, Open, etc.)
+    def _source_price(self):
+        """Get the source price (Close, High, Low, Open, etc.)"""
         if self.source == 'close':
-            source_price = self.data['Close']
+            return self.data['Close']
         elif self.source == 'high':
-            source_price = self.data['High']
+            return self.data['High']
         elif self.source == 'low':
-            source_price = self.data['Low']
+            return self.data['Low']
         elif self.source == 'open':
-            source_price = self.data['Open']
+            return self.data['Open']
         else:
-            source_price = self.data['Close']  # Default to Close
-        
-        # Calculate EMAs for MACD (Oscillator MA Type)
-        if self.oscillator_ma_type == 'EMA':
-            ema_fast = source_price.ewm(span=self.fast_length, adjust=False).mean()
-            ema_slow = source_price.ewm(span=self.slow_length, adjust=False).mean()
-        else:
-            # For other MA types, we'll use EMA as default (can be extended)
-            ema_fast = source_price.ewm(span=self.fast_length, adjust=False).mean()
-            ema_slow = source_price.ewm(span=self.slow_length, adjust=False).mean()
-        
-        # Calculate MACD line (Oscillator)
-        self.data['MACD'] = ema_fast - ema_slow
-        
-        # Calculate Signal line using Signal Line MA Type
-        if self.signal_line_ma_type == 'EMA':
-            self.data['Signal'] = self.data['MACD'].ewm(span=self.signal_smoothing, adjust=False).mean()
-        else:
-            # For other MA types, we'll use EMA as default (can be extended)
-            self.data['Signal'] = self.data['MACD'].ewm(span=self.signal_smoothing, adjust=False).mean()
-        
-        # Calculate Histogram
-        self.data['Histogram'] = self.data['MACD'] - self.data['Signal']
-        
-        # Identify crossovers (shifted values for comparison)
-        self.data['MACD_prev'] = self.data['MACD'].shift(1)
-        self.data['Signal_prev'] = self.data['Signal'].shift(1)
-        
-        # Bullish crossover: MACD crosses above Signal while below zero
-        self.data['Bullish_Cross'] = (
-            (self.data['MACD'] > self.data['Signal']) & 
-            (self.data['MACD_prev'] <= self.data['Signal_prev']) &
-            (self.data['MACD'] < 0) &
-            (self.data['Signal'] < 0)
+            return self.data['Close']  # Default to Close
+    
+    def calculate_macd(self):
+        """Calculate MACD, Signal line, and Histogram using TradingView settings"""
+        # MACD line, Signal line, Histogram and crossovers in one compiled pass
+        src = self._source_price().to_numpy()
+        oscillator_alpha = _MA_ALPHA.get(self.oscillator_ma_type, _ema_alpha)
+        signal_alpha = _MA_ALPHA.get(self.signal_line_ma_type, _ema_alpha)
+        kernel = _macd_kernel if NUMBA_AVAILABLE else _macd_lfilter
+        macd, signal, hist, cross = kernel(
+            src,
+            oscillator_alpha(self.fast_length),
+            oscillator_alpha(self.slow_length),
+            signal_alpha(self.signal_smoothing)
+        )
+        # Add all indicator columns in one step rather than one assignment each.
+        # Bullish_Cross: MACD crosses above Signal while below zero
+        self.data = self.data.assign(
+            MACD=macd,
+            Signal=signal,
+            Histogram=hist,
+            Bullish_Cross=cross
         )
         
     def backtest(self):
         """Run the backtest and track trades"""
-        position = None
-        entry_price = 0
-        entry_date = None
+        close = self.data['Close'].to_numpy()
+        cross = self.data['Bullish_Cross'].to_numpy(dtype=np.bool_, copy=False)
+        if not NUMBA_AVAILABLE or np.count_nonzero(cross) <= SPARSE_SIGNAL_DENSITY * len(close):
+            resolver = _resolve_trades
+        else:
+            resolver = _run_backtest
+        entry_idx, exit_idx, entry_px, exit_px, ret, reason, count = resolver(
+            close, cross, self.take_profit, self.stop_loss
+        )
         
-        for i in range(len(self.data)):
-            current_date = self.data.index[i]
-            current_price = float(self.data['Close'].iloc[i])
-            
-            # Check for entry signal
-            if position is None and bool(self.data['Bullish_Cross'].iloc[i]):
-                position = 'long'
-                entry_price = current_price
-                entry_date = current_date
-                
-            # Check for exit conditions
-            elif position == 'long':
-                # Calculate return
-                returns = (current_price - entry_price) / entry_price
-                
-                # Check take profit
-                if returns >= self.take_profit:
-                    self.trades.append({
-                        'Entry Date': entry_date,
-                        'Entry Price': entry_price,
-                        'Exit Date': current_date,
-                        'Exit Price': current_price,
-                        'Return': returns,
-                        'Exit Reason': 'Take Profit'
-                    })
-                    position = None
-                    
-                # Check stop loss
-                elif returns <= -self.stop_loss:
-                    self.trades.append({
-                        'Entry Date': entry_date,
-                        'Entry Price': entry_price,
-                        'Exit Date': current_date,
-                        'Exit Price': current_price,
-                        'Return': returns,
-                        'Exit Reason': 'Stop Loss'
-                    })
-                    position = None
-        
-        # Close any open position at the end
-        if position == 'long':
-            final_price = float(self.data['Close'].iloc[-1])
-            self.trades.append({
-                'Entry Date': entry_date,
-                'Entry Price': entry_price,
-                'Exit Date': self.data.index[-1],
-                'Exit Price': final_price,
-                'Return': (final_price - entry_price) / entry_price,
-                'Exit Reason': 'End of Period'
-            })
+        self._entry_idx = entry_idx[:count]
+        self._exit_idx = exit_idx[:count]
+        self._entry_px = entry_px[:count]
+        self._exit_px = exit_px[:count]
+        self._ret = ret[:count]
+        self._reason = reason[:count]
+        self._trades = None
+    
+    @property
+    def trades(self):
+        """Trades as a list of dicts, materialized from the trade arrays on first access"""
+        if self._trades is None:
+            # Only O(#trades) Python work here; convert each column once
+            index = self.data.index
+            self._trades = [
+                {
+                    'Entry Date': entry_date,
+                    'Entry Price': entry_price,
+                    'Exit Date': exit_date,
+                    'Exit Price': exit_price,
+                    'Return': returns,
+                    'Exit Reason': EXIT_REASONS[code]
+                }
+                for entry_date, entry_price, exit_date, exit_price, returns, code in zip(
+                    index[self._entry_idx],
+                    self._entry_px.tolist(),
+                    index[self._exit_idx],
+                    self._exit_px.tolist(),
+                    self._ret.tolist(),
+                    self._reason.tolist()
+                )
+            ]
+        return self._trades
     
     def calculate_performance(self):
         """Calculate strategy performance metrics"""
-        if not self.trades:
+        if len(self._ret) == 0:
             return {
                 'Total Trades': 0,
                 'Winning Trades': 0,
@@ -217,29 +496,30 @@ class CryptoMACDTradingStrategy:
                 'Worst Trade': 0
             }
         
-        trades_df = pd.DataFrame(self.trades)
-        
-        winning_trades = trades_df[trades_df['Return'] > 0]
-        losing_trades = trades_df[trades_df['Return'] <= 0]
+        ret = self._ret
+        total = len(ret)
+        winning = int(np.count_nonzero(ret > 0))
         
         performance = {
-            'Total Trades': len(trades_df),
-            'Winning Trades': len(winning_trades),
-            'Losing Trades': len(losing_trades),
-            'Win Rate': len(winning_trades) / len(trades_df) * 100 if len(trades_df) > 0 else 0,
-            'Total Return': trades_df['Return'].sum() * 100,
-            'Average Return': trades_df['Return'].mean() * 100,
-            'Best Trade': trades_df['Return'].max() * 100,
-            'Worst Trade': trades_df['Return'].min() * 100,
-            'Take Profit Hits': len(trades_df[trades_df['Exit Reason'] == 'Take Profit']),
-            'Stop Loss Hits': len(trades_df[trades_df['Exit Reason'] == 'Stop Loss'])
+            'Total Trades': total,
+            'Winning Trades': winning,
+            'Losing Trades': total - winning,
+            'Win Rate': winning / total * 100,
+            'Total Return': float(ret.sum()) * 100,
+            'Average Return': float(ret.mean()) * 100,
+            'Best Trade': float(ret.max()) * 100,
+            'Worst Trade': float(ret.min()) * 100,
+            'Take Profit Hits': int(np.count_nonzero(self._reason == 0)),
+            'Stop Loss Hits': int(np.count_nonzero(self._reason == 1))
         }
         
         return performance
     
     def plot_strategy(self):
         """Visualize the strategy with price and MACD indicators"""
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10), sharex=True)
+        # Figure API instead of pyplot: no global state, safe to call from worker threads
+        fig = Figure(figsize=(12, 7))
+        ax1, ax2 = fig.subplots(2, 1, sharex=True)
         
         # Plot price and entry signals
         ax1.plot(self.data.index, self.data['Close'], label='Close Price', linewidth=1)
@@ -250,11 +530,13 @@ class CryptoMACDTradingStrategy:
             ax1.scatter(entry_points.index, entry_points['Close'], 
                        color='green', marker='^', s=100, label='Buy Signal', zorder=5)
         
-        # Mark trade exits
-        for trade in self.trades:
-            color = 'lime' if trade['Return'] > 0 else 'red'
-            ax1.scatter(trade['Exit Date'], trade['Exit Price'], 
-                       color=color, marker='v', s=100, zorder=5)
+        # Mark trade exits, one scatter call for winners and one for losers
+        exit_dates = self.data.index[self._exit_idx]
+        win = self._ret > 0
+        ax1.scatter(exit_dates[win], self._exit_px[win], 
+                   color='lime', marker='v', s=100, zorder=5)
+        ax1.scatter(exit_dates[~win], self._exit_px[~win], 
+                   color='red', marker='v', s=100, zorder=5)
         
         ax1.set_ylabel('Price (USDT)')
         ax1.legend()
@@ -264,8 +546,12 @@ class CryptoMACDTradingStrategy:
         # Plot MACD
         ax2.plot(self.data.index, self.data['MACD'], label='MACD', color='blue', linewidth=1)
         ax2.plot(self.data.index, self.data['Signal'], label='Signal', color='red', linewidth=1)
-        ax2.bar(self.data.index, self.data['Histogram'], label='Histogram', 
-                color='gray', alpha=0.3, width=0.8)
+        # Downsample the histogram to ~2000 bars; more is invisible at this size
+        n = len(self.data)
+        k = max(1, n // 2000)
+        bar_step = (self.data.index[1] - self.data.index[0]) / pd.Timedelta(days=1) if n > 1 else 1.0
+        ax2.bar(self.data.index[::k], self.data['Histogram'].to_numpy()[::k], label='Histogram', 
+                color='gray', alpha=0.3, width=k * 0.8 * bar_step)
         ax2.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
         
         # Mark crossover points
@@ -278,11 +564,65 @@ class CryptoMACDTradingStrategy:
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.tight_layout()
         filename = f'{self.symbol}_{self.interval}_macd_strategy.png'
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        fig.savefig(filename, dpi=120)
         print(f"Chart saved as {filename}")
-        plt.close()
+    
+    def sweep(self, param_grid):
+        """
+        Backtest a grid of MACD settings on the already fetched data
+        
+        Parameters:
+        - param_grid: Dict with lists for any of 'fast_length', 'slow_length' and
+          'signal_smoothing'; missing keys use the strategy's own setting
+        
+        Returns a DataFrame with one row per combination, best Total Return first.
+        """
+        if self.data is None:
+            self.fetch_data()
+        
+        combos = np.array(list(itertools.product(
+            param_grid.get('fast_length', [self.fast_length]),
+            param_grid.get('slow_length', [self.slow_length]),
+            param_grid.get('signal_smoothing', [self.signal_smoothing])
+        )), dtype=np.int64).reshape(-1, 3)
+        
+        src = self._source_price().to_numpy()
+        close = self.data['Close'].to_numpy()
+        oscillator_alpha = _MA_ALPHA.get(self.oscillator_ma_type, _ema_alpha)
+        signal_alpha = _MA_ALPHA.get(self.signal_line_ma_type, _ema_alpha)
+        a_fasts = np.array([oscillator_alpha(f) for f in combos[:, 0]], dtype=np.float64)
+        a_slows = np.array([oscillator_alpha(s) for s in combos[:, 1]], dtype=np.float64)
+        a_sigs = np.array([signal_alpha(s) for s in combos[:, 2]], dtype=np.float64)
+        
+        if NUMBA_AVAILABLE:
+            total_return, win_rate, n_trades = _sweep(
+                src, close, a_fasts, a_slows, a_sigs, self.take_profit, self.stop_loss
+            )
+        else:
+            # Same results through the SciPy/NumPy paths, one combination at a time
+            total_return = np.zeros(len(combos))
+            win_rate = np.zeros(len(combos))
+            n_trades = np.zeros(len(combos), dtype=np.int64)
+            for c in range(len(combos)):
+                cross = _macd_lfilter(src, a_fasts[c], a_slows[c], a_sigs[c])[3]
+                ret, _, count = _resolve_trades(close, cross, self.take_profit, self.stop_loss)[4:]
+                if count:
+                    ret = ret[:count]
+                    total_return[c] = float(ret.sum()) * 100
+                    win_rate[c] = np.count_nonzero(ret > 0) / count * 100
+                    n_trades[c] = count
+        
+        results = pd.DataFrame({
+            'fast_length': combos[:, 0],
+            'slow_length': combos[:, 1],
+            'signal_smoothing': combos[:, 2],
+            'Total Trades': n_trades,
+            'Win Rate': win_rate,
+            'Total Return': total_return
+        })
+        return results.sort_values('Total Return', ascending=False, ignore_index=True)
     
     def run(self):
         """Execute the complete strategy"""
@@ -314,15 +654,26 @@ class CryptoMACDTradingStrategy:
                 print(f"{key}: {value}")
         
         # Display trade details
-        if self.trades:
+        if len(self._ret):
             print("\nTrade Details:")
             print("-" * 50)
-            trades_df = pd.DataFrame(self.trades)
-            trades_df['Return'] = trades_df['Return'] * 100  # Convert to percentage
-            trades_df['Entry Price'] = trades_df['Entry Price'].round(6)
-            trades_df['Exit Price'] = trades_df['Exit Price'].round(6)
-            trades_df['Return'] = trades_df['Return'].round(2)
-            print(trades_df.to_string())
+            # Built straight from the trade arrays; Exit Reason stays a categorical
+            # over the uint8 codes instead of a column of Python strings
+            index = self.data.index
+            trades_df = pd.DataFrame({
+                'Entry Date': index[self._entry_idx],
+                'Entry Price': self._entry_px,
+                'Exit Date': index[self._exit_idx],
+                'Exit Price': self._exit_px,
+                'Return': self._ret,
+                'Exit Reason': pd.Categorical.from_codes(self._reason, categories=EXIT_REASONS)
+            })
+            # Format at print time instead of rewriting the columns
+            print(trades_df.to_string(formatters={
+                'Entry Price': '{:.6f}'.format,
+                'Exit Price': '{:.6f}'.format,
+                'Return': lambda r: f'{r * 100:.2f}'  # Convert to percentage
+            }))
         
         return performance, self.trades
 
@@ -348,42 +699,34 @@ if __name__ == "__main__":
     print(f"Source: {source}, Oscillator MA: {oscillator_ma_type}, Signal Line MA: {signal_line_ma_type}")
     print("=" * 80)
     
-    try:
-        # Create and run strategy with TradingView settings
-        strategy = CryptoMACDTradingStrategy(
-            symbol=symbol, 
-            days_back=days_back, 
-            interval=interval,
-            fast_length=fast_length,
-            slow_length=slow_length,
-            signal_smoothing=signal_smoothing,
-            source=source,
-            oscillator_ma_type=oscillator_ma_type,
-            signal_line_ma_type=signal_line_ma_type
-        )
+    def run_and_plot(strategy):
+        """Run one timeframe's backtest and save its chart"""
         performance, trades = strategy.run()
-        
-        # Plot results
         strategy.plot_strategy()
+        return performance, trades
+    
+    try:
+        # Same TradingView MACD settings on 5m and 15m for comparison.
+        # Both runs are dominated by network I/O and chart rendering, so they
+        # run concurrently; each writes its own chart file.
+        strategies = [
+            CryptoMACDTradingStrategy(
+                symbol=symbol, 
+                days_back=days_back, 
+                interval=timeframe,
+                fast_length=fast_length,
+                slow_length=slow_length,
+                signal_smoothing=signal_smoothing,
+                source=source,
+                oscillator_ma_type=oscillator_ma_type,
+                signal_line_ma_type=signal_line_ma_type
+            )
+            for timeframe in (interval, "15m")
+        ]
         
-        # Test with different timeframes using same MACD settings
-        print(f"\n{'='*80}")
-        print("Testing with 15-minute timeframe for comparison (same MACD settings):")
-        print("=" * 80)
-        
-        strategy_15m = CryptoMACDTradingStrategy(
-            symbol=symbol, 
-            days_back=days_back, 
-            interval="15m",
-            fast_length=fast_length,
-            slow_length=slow_length,
-            signal_smoothing=signal_smoothing,
-            source=source,
-            oscillator_ma_type=oscillator_ma_type,
-            signal_line_ma_type=signal_line_ma_type
-        )
-        performance_15m, trades_15m = strategy_15m.run()
-        strategy_15m.plot_strategy()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(run_and_plot, strategy) for strategy in strategies]
+            results = [future.result() for future in futures]
         
     except Exception as e:
         print(f"Error: {e}")
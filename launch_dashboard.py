@@ -107,10 +107,14 @@ def generate_new_data():
     
     try:
         import subprocess
-        result = subprocess.run([sys.executable, "interactive_macd_strategy.py"], 
-                              capture_output=True, text=True)
+        # Stream the backtest output as it is produced instead of buffering it all
+        with subprocess.Popen([sys.executable, "interactive_macd_strategy.py"],
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, bufsize=1) as process:
+            for line in process.stdout:
+                sys.stdout.write(line)
         
-        if result.returncode == 0:
+        if process.returncode == 0:
             print("✅ New strategy data generated successfully!")
             print("📁 Files created:")
             print("   • ROSEUSDT_5m_interactive_macd.html")
@@ -118,8 +122,7 @@ def generate_new_data():
             print()
             print("🎯 You can now use options 1-3 to view the results!")
         else:
-            print("❌ Error generating data:")
-            print(result.stderr)
+            print(f"❌ Error generating data (exit code {process.returncode})")
     except Exception as e:
         print(f"❌ Error: {e}")
 
@@ -3,23 +3,14 @@ Modern Trading Strategy System - Refactored Architecture
 Main entry point that demonstrates the new modular structure
 """
 
-import sys
-import os
+import logging
+import numpy as np
 
-# Add the current directory to Python path for imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-src_dir = os.path.join(current_dir, 'src')
-sys.path.insert(0, current_dir)
-sys.path.insert(0, src_dir)
+from src.data_provider import BinanceDataProvider, DataManager
+from src.indicators import MACDCalculator, IndicatorManager, MovingAverageCalculator, ema_loop
+from src.strategy import MACDStrategy, RiskManager, StrategyEngine
 
-try:
-    from data_provider import BinanceDataProvider, DataManager
-    from indicators import MACDCalculator, IndicatorManager, MovingAverageCalculator
-    from strategy import MACDStrategy, RiskManager, StrategyEngine
-except ImportError as e:
-    print(f"Import error: {e}")
-    print("Please ensure all dependencies are installed and you're in the correct directory")
-    sys.exit(1)
+logger = logging.getLogger(__name__)
 
 
 class ModernTradingSystem:
@@ -38,6 +29,11 @@ class ModernTradingSystem:
         self.indicator_manager = IndicatorManager()
         self.strategy_engine = None
         
+        # Last committed EMA values for O(1) real-time indicator updates, plus the
+        # latest fetched candle, which may still be open when the stream starts
+        self._ema_state: dict = {}
+        self._pending_candle = None
+        
         # Setup indicators
         self.setup_indicators()
     
@@ -130,7 +126,14 @@ class ModernTradingSystem:
                 print()
     
     def export_for_frontend(self) -> dict:
-        """Export data in format suitable for React frontend"""
+        """
+        Export data in format suitable for React frontend
+        
+        Market data is returned as flat NumPy columns (t = open time in epoch ms,
+        o/h/l/c/v = prices and volume). Indicators share the same time axis, so
+        they carry only their values. Serialize with orjson.OPT_SERIALIZE_NUMPY,
+        which writes NaN warm-up values as null.
+        """
         if not self.strategy_engine:
             raise ValueError("Run backtest first")
         
@@ -139,24 +142,27 @@ class ModernTradingSystem:
         indicators = self.indicator_manager.results
         
         # Export everything as JSON-ready format
+        macd = indicators['MACD']
         return {
             'market_data': {
                 'symbol': self.symbol,
                 'interval': self.interval,
                 'timezone': self.timezone,
-                'ohlcv': data.to_dict('records'),
-                'timestamps': data.index.astype(str).tolist()
+                't': data.index.as_unit('ms').asi8,
+                'o': data['Open'].to_numpy(),
+                'h': data['High'].to_numpy(),
+                'l': data['Low'].to_numpy(),
+                'c': data['Close'].to_numpy(),
+                'v': data['Volume'].to_numpy()
             },
             'indicators': {
                 'macd': {
-                    'values': indicators['MACD']['MACD'].fillna(None).tolist(),
-                    'signal': indicators['MACD']['Signal'].fillna(None).tolist(),
-                    'histogram': indicators['MACD']['Histogram'].fillna(None).tolist(),
-                    'timestamps': indicators['MACD']['MACD'].index.astype(str).tolist()
+                    'values': macd['MACD'].to_numpy(),
+                    'signal': macd['Signal'].to_numpy(),
+                    'histogram': macd['Histogram'].to_numpy()
                 },
                 'ema_200': {
-                    'values': indicators['EMA_200']['EMA_200'].fillna(None).tolist() if 'EMA_200' in indicators else [],
-                    'timestamps': indicators['EMA_200']['EMA_200'].index.astype(str).tolist() if 'EMA_200' in indicators else []
+                    'values': indicators['EMA_200']['EMA_200'].to_numpy() if 'EMA_200' in indicators else []
                 }
             },
             'strategy_results': self.strategy_engine.export_results_json(),
@@ -167,18 +173,85 @@ class ModernTradingSystem:
             }
         }
     
+    def _ema_alphas(self) -> dict:
+        """EMA smoothing factors of the configured indicators"""
+        macd_calc = self.indicator_manager.indicators['MACD']
+        ema_calc = self.indicator_manager.indicators['EMA_200']
+        return {
+            'fast': 2.0 / (macd_calc.fast_length + 1),
+            'slow': 2.0 / (macd_calc.slow_length + 1),
+            'signal': 2.0 / (macd_calc.signal_smoothing + 1),
+            'ema_200': 2.0 / (ema_calc.period + 1)
+        }
+    
+    def _seed_ema_state(self, data):
+        """Run the EMAs over the fetched history once; the stream then updates them per candle"""
+        self._ema_state = {}
+        self._pending_candle = None
+        if data is None or data.empty:
+            return
+        
+        alphas = self._ema_alphas()
+        close = data['Close'].to_numpy(dtype=np.float64)[:-1]
+        if len(close):
+            fast = ema_loop(close, alphas['fast'])
+            slow = ema_loop(close, alphas['slow'])
+            self._ema_state = {
+                'fast': fast[-1],
+                'slow': slow[-1],
+                'signal': ema_loop(fast - slow, alphas['signal'])[-1],
+                'ema_200': ema_loop(close, alphas['ema_200'])[-1]
+            }
+        # The last fetched candle is only committed once the stream moves past it
+        self._pending_candle = (data.index[-1], float(data['Close'].iloc[-1]))
+    
+    def _update_ema_state(self, close: float, commit: bool) -> dict:
+        """
+        Advance the EMAs by one candle using EMA_t = a * X_t + (1 - a) * EMA_t-1
+        
+        Only closed candles are committed; updates for the open candle are
+        computed from the last committed state and discarded.
+        """
+        alphas = self._ema_alphas()
+        state = self._ema_state
+        if not state:
+            # First candle seeds the EMAs, like pandas ewm(adjust=False)
+            state = {'fast': close, 'slow': close, 'signal': 0.0, 'ema_200': close}
+        
+        fast = alphas['fast'] * close + (1 - alphas['fast']) * state['fast']
+        slow = alphas['slow'] * close + (1 - alphas['slow']) * state['slow']
+        macd = fast - slow
+        signal = alphas['signal'] * macd + (1 - alphas['signal']) * state['signal']
+        ema_200 = alphas['ema_200'] * close + (1 - alphas['ema_200']) * state['ema_200']
+        
+        if commit:
+            self._ema_state = {'fast': fast, 'slow': slow, 'signal': signal, 'ema_200': ema_200}
+        
+        return {'MACD': macd, 'Signal': signal, 'Histogram': macd - signal, 'EMA_200': ema_200}
+    
     def start_real_time_mode(self):
         """Start real-time trading mode"""
         print(f"🔴 Starting real-time mode for {self.symbol} {self.interval}")
         
+        self._seed_ema_state(self.data_manager.current_data)
+        
         def on_new_candle(candle_data):
-            print(f"📊 New candle: {candle_data['Close']:.6f} at {candle_data['timestamp']}")
+            logger.debug("New candle: %.6f at %s", candle_data['Close'], candle_data['timestamp'])
+            
+            # Commit the last fetched candle once the stream has moved past it;
+            # updates for the same open time replace it instead
+            if self._pending_candle is not None:
+                pending_time, pending_close = self._pending_candle
+                if candle_data['timestamp'] > pending_time:
+                    self._update_ema_state(pending_close, commit=True)
+                    self._pending_candle = None
+                elif candle_data['timestamp'] == pending_time:
+                    self._pending_candle = None
             
-            # In real implementation, you'd:
-            # 1. Update indicators with new data
-            # 2. Generate new signals
-            # 3. Update positions
-            # 4. Send updates to frontend via WebSocket
+            # Point update of the indicators, independent of the history length
+            point = self._update_ema_state(candle_data['Close'], commit=candle_data['is_closed'])
+            logger.debug("MACD: %.6f | Signal: %.6f | Histogram: %.6f | EMA 200: %.6f",
+                         point['MACD'], point['Signal'], point['Histogram'], point['EMA_200'])
         
         self.data_manager.add_real_time_callback(on_new_candle)
         self.data_manager.start_real_time_feed(self.symbol, self.interval)
@@ -231,6 +304,7 @@ def main():
         
         # Real-time mode example (uncomment to test)
         # print(f"\n🔴 Starting real-time mode for 30 seconds...")
+        # logging.basicConfig(level=logging.DEBUG)  # Show per-candle indicator updates
         # trading_system.start_real_time_mode()
         # time.sleep(30)
         # trading_system.stop_real_time_mode()
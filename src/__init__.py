@@ -1 +1,9 @@
 # Trading Strategy Package
+from .data_provider import DataProvider, BinanceDataProvider, DataManager
+from .indicators import (
+    IndicatorCalculator, MACDCalculator, RSICalculator,
+    MovingAverageCalculator, IndicatorManager
+)
+from .strategy import (
+    Trade, Position, TradeStore, RiskManager, BaseStrategy, MACDStrategy, StrategyEngine
+)
@@ -1,20 +1,54 @@
 """
 API Server - RESTful API and WebSocket server for real-time data
 Provides endpoints for React/React Native frontend
+
+Run from the repository root: python -m src.api_server [--port 5000]
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
-import json
+import orjson
 import threading
 import time
 from datetime import datetime
 from typing import Dict, Any
+from cachetools import TLRUCache
+
+from src.data_provider import BinanceDataProvider, DataManager, interval_seconds
+from src.indicators import MACDCalculator, IndicatorManager, MovingAverageCalculator
+from src.strategy import MACDStrategy, RiskManager, StrategyEngine
+
 
-from data_provider import BinanceDataProvider, DataManager
-from indicators import MACDCalculator, IndicatorManager, MovingAverageCalculator
-from strategy import MACDStrategy, RiskManager, StrategyEngine
+# Common trading pairs offered by /api/symbols
+SYMBOLS = [
+    "BTCUSDT", "ETHUSDT", "ADAUSDT", "DOTUSDT", "LINKUSDT",
+    "LTCUSDT", "BCHUSDT", "XLMUSDT", "EOSUSDT", "TRXUSDT",
+    "ROSEUSDT", "SOLUSDT", "AVAXUSDT", "MATICUSDT", "UNIUSDT"
+]
+
+# Supported timeframes offered by /api/intervals
+INTERVALS = [
+    {"value": "1m", "label": "1 Minute"},
+    {"value": "3m", "label": "3 Minutes"},
+    {"value": "5m", "label": "5 Minutes"},
+    {"value": "15m", "label": "15 Minutes"},
+    {"value": "30m", "label": "30 Minutes"},
+    {"value": "1h", "label": "1 Hour"},
+    {"value": "2h", "label": "2 Hours"},
+    {"value": "4h", "label": "4 Hours"},
+    {"value": "6h", "label": "6 Hours"},
+    {"value": "8h", "label": "8 Hours"},
+    {"value": "12h", "label": "12 Hours"},
+    {"value": "1d", "label": "1 Day"}
+]
+
+def _data_cache_expiry(key, value, now):
+    """Cached /api/data responses live for half a bar (at least 10s)"""
+    try:
+        ttl = max(10, interval_seconds(key[1]) // 2)
+    except (KeyError, ValueError):
+        ttl = 10
+    return now + ttl
 
 
 class TradingAPI:
@@ -24,6 +58,9 @@ class TradingAPI:
         self.app = Flask(__name__)
         self.app.config['SECRET_KEY'] = 'trading_secret_key'
         CORS(self.app)
+        
+        # Imported here so importing this module for its REST pieces stays light
+        from flask_socketio import SocketIO
         self.socketio = SocketIO(self.app, cors_allowed_origins="*")
         self.port = port
         
@@ -33,6 +70,19 @@ class TradingAPI:
         self.strategy_engine = None
         self.real_time_thread = None
         self.is_streaming = False
+        self.received_candles = 0
+        
+        # One provider (and Binance client) per timezone, shared across requests
+        self._providers = {}
+        self._providers_lock = threading.Lock()
+        
+        # Serialized /api/data responses keyed by (symbol, interval, days_back, timezone)
+        self._data_cache = TLRUCache(maxsize=128, ttu=_data_cache_expiry)
+        self._data_cache_lock = threading.Lock()
+        
+        # Static responses are serialized once and served as-is
+        self._symbols_json = orjson.dumps({"symbols": SYMBOLS})
+        self._intervals_json = orjson.dumps({"intervals": INTERVALS})
         
         self.setup_routes()
         self.setup_websocket_handlers()
@@ -46,31 +96,11 @@ class TradingAPI:
         
         @self.app.route('/api/symbols', methods=['GET'])
         def get_symbols():
-            # Return common trading pairs
-            symbols = [
-                "BTCUSDT", "ETHUSDT", "ADAUSDT", "DOTUSDT", "LINKUSDT",
-                "LTCUSDT", "BCHUSDT", "XLMUSDT", "EOSUSDT", "TRXUSDT",
-                "ROSEUSDT", "SOLUSDT", "AVAXUSDT", "MATICUSDT", "UNIUSDT"
-            ]
-            return jsonify({"symbols": symbols})
+            return self._static_json(self._symbols_json)
         
         @self.app.route('/api/intervals', methods=['GET'])
         def get_intervals():
-            intervals = [
-                {"value": "1m", "label": "1 Minute"},
-                {"value": "3m", "label": "3 Minutes"},
-                {"value": "5m", "label": "5 Minutes"},
-                {"value": "15m", "label": "15 Minutes"},
-                {"value": "30m", "label": "30 Minutes"},
-                {"value": "1h", "label": "1 Hour"},
-                {"value": "2h", "label": "2 Hours"},
-                {"value": "4h", "label": "4 Hours"},
-                {"value": "6h", "label": "6 Hours"},
-                {"value": "8h", "label": "8 Hours"},
-                {"value": "12h", "label": "12 Hours"},
-                {"value": "1d", "label": "1 Day"}
-            ]
-            return jsonify({"intervals": intervals})
+            return self._static_json(self._intervals_json)
         
         @self.app.route('/api/data/<symbol>/<interval>', methods=['GET'])
         def get_historical_data(symbol, interval):
@@ -78,8 +108,14 @@ class TradingAPI:
                 days_back = int(request.args.get('days', 7))
                 timezone = request.args.get('timezone', 'UTC')
                 
+                cache_key = (symbol, interval, days_back, timezone)
+                with self._data_cache_lock:
+                    payload = self._data_cache.get(cache_key)
+                if payload is not None:
+                    return Response(payload, mimetype='application/json')
+                
                 # Initialize data provider
-                provider = BinanceDataProvider(timezone=timezone)
+                provider = self._get_provider(timezone)
                 self.data_manager = DataManager(provider)
                 
                 # Fetch data
@@ -97,11 +133,16 @@ class TradingAPI:
                 data_json = self.data_manager.export_data_json(data)
                 indicators_json = self.indicator_manager.export_indicators_json()
                 
-                return jsonify({
+                # Embed the exported JSON as-is and keep the bytes for repeat requests
+                payload = orjson.dumps({
                     "success": True,
-                    "data": json.loads(data_json),
-                    "indicators": json.loads(indicators_json)
+                    "data": orjson.Fragment(data_json),
+                    "indicators": orjson.Fragment(indicators_json)
                 })
+                with self._data_cache_lock:
+                    self._data_cache[cache_key] = payload
+                
+                return Response(payload, mimetype='application/json')
                 
             except Exception as e:
                 print(f"Error in get_historical_data: {e}")
@@ -126,22 +167,21 @@ class TradingAPI:
                 signal_smoothing = config.get('signal_smoothing', 9)
                 
                 # Initialize components
-                provider = BinanceDataProvider(timezone=timezone)
+                provider = self._get_provider(timezone)
                 self.data_manager = DataManager(provider)
                 
                 # Fetch data
                 data = self.data_manager.get_historical_data(symbol, interval, days_back)
                 
-                # Calculate indicators
+                # Calculate indicators (the 200 EMA filter comes from the same pass)
                 self.indicator_manager = IndicatorManager()
                 macd_calc = MACDCalculator(
                     fast_length=fast_length,
                     slow_length=slow_length,
-                    signal_smoothing=signal_smoothing
+                    signal_smoothing=signal_smoothing,
+                    trend_length=200
                 )
-                ema_200_calc = MovingAverageCalculator(period=200, ma_type='EMA')
                 self.indicator_manager.add_indicator('MACD', macd_calc)
-                self.indicator_manager.add_indicator('EMA_200', ema_200_calc)
                 indicators = self.indicator_manager.calculate_all(data)
                 
                 # Run strategy
@@ -171,18 +211,22 @@ class TradingAPI:
                     return jsonify({"success": False, "error": "Stream already running"})
                 
                 # Initialize for real-time
-                provider = BinanceDataProvider(timezone=timezone)
+                provider = self._get_provider(timezone)
                 self.data_manager = DataManager(provider)
                 
-                # Setup real-time callback
+                # Setup real-time callback: serialize each candle once and
+                # broadcast the same bytes to every client
                 def on_real_time_data(candle_data):
-                    self.socketio.emit('market_data', {
-                        'symbol': symbol,
-                        'interval': interval,
-                        'data': candle_data,
-                        'timestamp': datetime.now().isoformat()
+                    payload = orjson.dumps({
+                        's': symbol,
+                        'i': interval,
+                        'd': {**candle_data, 'timestamp': candle_data['timestamp'].isoformat()},
+                        'ts': int(time.time() * 1000)
                     })
+                    self.socketio.emit('market_data', payload, namespace='/')
+                    self.received_candles += 1
                 
+                self.received_candles = 0
                 self.data_manager.add_real_time_callback(on_real_time_data)
                 self.data_manager.start_real_time_feed(symbol, interval)
                 self.is_streaming = True
@@ -192,6 +236,14 @@ class TradingAPI:
             except Exception as e:
                 return jsonify({"success": False, "error": str(e)}), 400
         
+        @self.app.route('/api/stream/status', methods=['GET'])
+        def get_stream_status():
+            return jsonify({
+                "success": True,
+                "is_streaming": self.is_streaming,
+                "received_candles": self.received_candles
+            })
+        
         @self.app.route('/api/stream/stop', methods=['POST'])
         def stop_real_time_stream():
             try:
@@ -204,8 +256,25 @@ class TradingAPI:
             except Exception as e:
                 return jsonify({"success": False, "error": str(e)}), 400
     
+    def _get_provider(self, timezone: str) -> BinanceDataProvider:
+        """Return the shared data provider for a timezone, creating it on first use"""
+        with self._providers_lock:
+            provider = self._providers.get(timezone)
+            if provider is None:
+                provider = BinanceDataProvider(timezone=timezone)
+                self._providers[timezone] = provider
+            return provider
+    
+    @staticmethod
+    def _static_json(payload: bytes) -> Response:
+        """Response for precomputed JSON that clients may cache for a day"""
+        response = Response(payload, mimetype='application/json')
+        response.headers['Cache-Control'] = 'public, max-age=86400'
+        return response
+    
     def setup_websocket_handlers(self):
         """Setup WebSocket event handlers"""
+        from flask_socketio import emit
         
         @self.socketio.on('connect')
         def handle_connect():
@@ -242,6 +311,7 @@ class TradingAPI:
         print(f"  - GET  /api/data/<symbol>/<interval>")
         print(f"  - POST /api/backtest/<symbol>/<interval>")
         print(f"  - POST /api/stream/start")
+        print(f"  - GET  /api/stream/status")
         print(f"  - POST /api/stream/stop")
         print(f"  - WebSocket: /socket.io/")
         
@@ -3,21 +3,104 @@ Data Provider - Handles all data fetching and real-time connections
 Separates data concerns from strategy logic
 """
 
+import asyncio
+import logging
+import math
+import queue
+import threading
 import pandas as pd
 import numpy as np
 from binance.client import Client
 from datetime import datetime, timedelta
 import pytz
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional, Callable
-import json
+import orjson
 
-# Optional import for real-time streaming (not required for basic functionality)
+logger = logging.getLogger(__name__)
+
+# Optional import for real-time streaming (not required for basic functionality).
+# Resolved on first use so historical-only runs don't import the websocket stack.
+ThreadedWebsocketManager = None
+WEBSOCKET_AVAILABLE = None
+
+# Optional import for concurrent kline downloads (falls back to python-binance)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+# Optional faster event loop for the async kline downloads
 try:
-    from binance import ThreadedWebsocketManager
-    WEBSOCKET_AVAILABLE = True
+    import uvloop
+    UVLOOP_AVAILABLE = True
 except ImportError:
-    ThreadedWebsocketManager = None
-    WEBSOCKET_AVAILABLE = False
+    uvloop = None
+    UVLOOP_AVAILABLE = False
+
+
+BINANCE_KLINES_URL = 'https://api.binance.com/api/v3/klines'
+KLINES_PER_REQUEST = 1000  # Binance maximum for /api/v3/klines
+MAX_CONCURRENT_REQUESTS = 8
+REQUEST_TIMEOUT = 10  # Seconds; python-binance otherwise waits indefinitely
+TICK_QUEUE_SIZE = 4096  # Candles buffered between the websocket reader and callbacks
+
+# Seconds per unit of a Binance interval string ('M' is a 30-day month)
+_INTERVAL_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'M': 2592000}
+
+
+def interval_seconds(interval: str) -> int:
+    """Length of one bar in seconds, e.g. '5m' -> 300"""
+    return int(interval[:-1]) * _INTERVAL_UNIT_SECONDS[interval[-1]]
+
+
+def _load_websocket_manager():
+    """Import ThreadedWebsocketManager on first call; returns None if unavailable"""
+    global ThreadedWebsocketManager, WEBSOCKET_AVAILABLE
+    if WEBSOCKET_AVAILABLE is None:
+        try:
+            from binance import ThreadedWebsocketManager
+            WEBSOCKET_AVAILABLE = True
+        except ImportError:
+            WEBSOCKET_AVAILABLE = False
+    return ThreadedWebsocketManager
+
+
+async def _fetch_klines_async(symbol: str, interval: str, start_ms: int, end_ms: int) -> List[list]:
+    """
+    Download klines in [start_ms, end_ms] with concurrent 1000-bar range requests
+    
+    The range is split up front from the bar length, so every page is requested
+    at once instead of walking the history one page at a time.
+    """
+    bar_ms = interval_seconds(interval) * 1000
+    chunk_ms = KLINES_PER_REQUEST * bar_ms
+    chunk_count = max(1, math.ceil((end_ms - start_ms) / chunk_ms))
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def fetch_chunk(session, chunk_start):
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'startTime': chunk_start,
+            'endTime': min(chunk_start + chunk_ms - 1, end_ms),
+            'limit': KLINES_PER_REQUEST
+        }
+        async with semaphore:
+            async with session.get(BINANCE_KLINES_URL, params=params) as response:
+                response.raise_for_status()
+                return orjson.loads(await response.read())
+    
+    async with aiohttp.ClientSession() as session:
+        chunks = await asyncio.gather(*(
+            fetch_chunk(session, start_ms + i * chunk_ms) for i in range(chunk_count)
+        ))
+    
+    # Chunks cover disjoint, ordered time ranges
+    return [kline for chunk in chunks for kline in chunk]
 
 
 class DataProvider:
@@ -44,9 +127,32 @@ class BinanceDataProvider(DataProvider):
     
     def __init__(self, timezone: str = 'UTC', api_key: str = None, api_secret: str = None):
         super().__init__(timezone)
-        self.client = Client(api_key, api_secret)
+        self.client = Client(api_key, api_secret, requests_params={'timeout': REQUEST_TIMEOUT})
+        
+        # Larger keep-alive pool so concurrent fetches reuse TLS connections,
+        # with retries on rate limiting and transient server errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.1,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.client.session.mount('https://', adapter)
         self.ws_manager = None
         self.stream_callback = None
+        self._tick_q = None
+        self._drain_thread = None
+        self._drain_stop = None
+        self.dropped_ticks = 0
+        
+        # Resolve the target timezone once instead of per fetch / per message
+        self._utc = pytz.UTC
+        self._target_tz = None
+        if timezone != 'UTC':
+            try:
+                self._target_tz = pytz.timezone(timezone)
+            except Exception as e:
+                print(f"Warning: Could not convert to timezone {timezone}, using UTC. Error: {e}")
         
     def get_historical_data(self, symbol: str, interval: str, days_back: int) -> pd.DataFrame:
         """Fetch historical price data from Binance"""
@@ -54,56 +160,61 @@ class BinanceDataProvider(DataProvider):
             start_time = datetime.now() - timedelta(days=days_back)
             start_str = start_time.strftime('%Y-%m-%d')
             
-            klines = self.client.get_historical_klines(symbol, interval, start_str)
+            klines = self._fetch_klines(symbol, interval, start_str)
             
             if not klines:
                 raise ValueError(f"No data found for {symbol}")
             
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
+            # Parse only open time + OHLCV into preallocated buffers; the
+            # Fortran-ordered block keeps each price column contiguous
+            n = len(klines)
+            ts = np.empty(n, dtype='int64')
+            ohlcv = np.empty((n, 5), dtype=np.float64, order='F')
+            for i, k in enumerate(klines):
+                ts[i] = k[0]
+                ohlcv[i, 0] = float(k[1])
+                ohlcv[i, 1] = float(k[2])
+                ohlcv[i, 2] = float(k[3])
+                ohlcv[i, 3] = float(k[4])
+                ohlcv[i, 4] = float(k[5])
             
-            # Convert timestamp and set as index
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            index = pd.DatetimeIndex(ts.view('datetime64[ms]'), name='timestamp')
             
             # Convert from UTC to specified timezone
-            if self.timezone != 'UTC':
-                try:
-                    utc = pytz.UTC
-                    target_tz = pytz.timezone(self.timezone)
-                    df['timestamp'] = df['timestamp'].dt.tz_localize(utc).dt.tz_convert(target_tz)
-                    print(f"Converted timestamps from UTC to {self.timezone}")
-                except Exception as e:
-                    print(f"Warning: Could not convert to timezone {self.timezone}, using UTC. Error: {e}")
-            
-            df.set_index('timestamp', inplace=True)
+            if self._target_tz:
+                index = index.tz_localize(self._utc).tz_convert(self._target_tz)
+                print(f"Converted timestamps from UTC to {self.timezone}")
             
-            # Convert price columns to numeric
-            price_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in price_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Standardize column names
-            df.rename(columns={
-                'open': 'Open',
-                'high': 'High', 
-                'low': 'Low',
-                'close': 'Close',
-                'volume': 'Volume'
-            }, inplace=True)
-            
-            result_df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+            result_df = pd.DataFrame(
+                ohlcv, columns=['Open', 'High', 'Low', 'Close', 'Volume'], index=index
+            )
             print(f"Fetched {len(result_df)} {interval} candles for {symbol}")
             return result_df
             
         except Exception as e:
             raise ValueError(f"Error fetching data for {symbol}: {str(e)}")
     
+    def _fetch_klines(self, symbol: str, interval: str, start_str: str) -> List[list]:
+        """Fetch raw klines from start_str (UTC date) until now"""
+        try:
+            asyncio.get_running_loop()
+            loop_running = True
+        except RuntimeError:
+            loop_running = False
+        
+        # asyncio.run cannot be nested inside a running event loop
+        if not AIOHTTP_AVAILABLE or loop_running:
+            return self.client.get_historical_klines(symbol, interval, start_str)
+        
+        start_ms = pd.Timestamp(start_str, tz='UTC').value // 10**6
+        end_ms = pd.Timestamp.now(tz='UTC').value // 10**6
+        run = uvloop.run if UVLOOP_AVAILABLE else asyncio.run
+        return run(_fetch_klines_async(symbol, interval, start_ms, end_ms))
+    
     def start_real_time_stream(self, symbol: str, interval: str, callback: Callable) -> None:
         """Start real-time kline stream from Binance"""
-        if not WEBSOCKET_AVAILABLE:
+        ws_manager_cls = _load_websocket_manager()
+        if ws_manager_cls is None:
             print("Warning: WebSocket not available. Real-time streaming disabled.")
             return
             
@@ -111,17 +222,31 @@ class BinanceDataProvider(DataProvider):
             self.stop_real_time_stream()
             
         self.stream_callback = callback
-        self.ws_manager = ThreadedWebsocketManager()
+        self.dropped_ticks = 0
+        
+        # Callbacks run on a separate thread fed through a bounded queue, so a
+        # slow callback can't stall the websocket reader
+        self._tick_q = queue.Queue(maxsize=TICK_QUEUE_SIZE)
+        self._drain_stop = threading.Event()
+        self._drain_thread = threading.Thread(
+            target=self._drain, args=(self._tick_q, callback, self._drain_stop), daemon=True
+        )
+        self._drain_thread.start()
+        
+        self.ws_manager = ws_manager_cls()
         self.ws_manager.start()
         
+        tick_q = self._tick_q
+        
         def handle_socket_message(msg):
             """Process incoming websocket message"""
             try:
                 kline_data = msg['k']
                 
-                # Convert to standardized format
+                # Convert to standardized format; the timestamp is converted
+                # on the drain thread
                 candle = {
-                    'timestamp': pd.to_datetime(kline_data['t'], unit='ms'),
+                    'timestamp': kline_data['t'],
                     'Open': float(kline_data['o']),
                     'High': float(kline_data['h']),
                     'Low': float(kline_data['l']),
@@ -130,21 +255,13 @@ class BinanceDataProvider(DataProvider):
                     'is_closed': kline_data['x']  # True when kline is closed
                 }
                 
-                # Apply timezone conversion
-                if self.timezone != 'UTC':
-                    try:
-                        utc = pytz.UTC
-                        target_tz = pytz.timezone(self.timezone)
-                        candle['timestamp'] = candle['timestamp'].tz_localize(utc).tz_convert(target_tz)
-                    except Exception:
-                        pass  # Keep UTC if conversion fails
-                
-                # Call the registered callback
-                if self.stream_callback:
-                    self.stream_callback(candle)
+                try:
+                    tick_q.put_nowait(candle)
+                except queue.Full:
+                    self.dropped_ticks += 1
                     
-            except Exception as e:
-                print(f"Error processing websocket message: {e}")
+            except Exception:
+                logger.exception("Error processing websocket message")
         
         # Start kline stream
         self.ws_manager.start_kline_socket(
@@ -155,12 +272,37 @@ class BinanceDataProvider(DataProvider):
         
         print(f"Started real-time stream for {symbol} {interval}")
     
+    def _drain(self, tick_q: queue.Queue, callback: Callable, stop: threading.Event) -> None:
+        """Deliver queued candles to the stream callback until the stream stops"""
+        while not stop.is_set():
+            try:
+                candle = tick_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            try:
+                # Apply timezone conversion
+                timestamp = pd.Timestamp(candle['timestamp'], unit='ms')
+                if self._target_tz:
+                    timestamp = timestamp.tz_localize(self._utc).tz_convert(self._target_tz)
+                candle['timestamp'] = timestamp
+                
+                callback(candle)
+            except Exception:
+                logger.exception("Error processing websocket message")
+    
     def stop_real_time_stream(self) -> None:
         """Stop the real-time websocket stream"""
         if self.ws_manager:
             self.ws_manager.stop()
             self.ws_manager = None
             self.stream_callback = None
+            self._drain_stop.set()
+            self._drain_stop = None
+            self._drain_thread = None
+            self._tick_q = None
+            if self.dropped_ticks:
+                print(f"Warning: Dropped {self.dropped_ticks} candles while callbacks were busy")
             print("Stopped real-time stream")
 
 
@@ -170,11 +312,15 @@ class DataManager:
     def __init__(self, provider: DataProvider):
         self.provider = provider
         self.current_data = None
+        self.current_symbol = None
+        self.current_interval = None
         self.real_time_callbacks = []
         
     def get_historical_data(self, symbol: str, interval: str, days_back: int) -> pd.DataFrame:
         """Get historical data through the provider"""
         self.current_data = self.provider.get_historical_data(symbol, interval, days_back)
+        self.current_symbol = symbol
+        self.current_interval = interval
         return self.current_data
     
     def add_real_time_callback(self, callback: Callable) -> None:
@@ -188,8 +334,8 @@ class DataManager:
             for callback in self.real_time_callbacks:
                 try:
                     callback(candle_data)
-                except Exception as e:
-                    print(f"Error in callback: {e}")
+                except Exception:
+                    logger.exception("Error in callback")
         
         self.provider.start_real_time_stream(symbol, interval, data_callback)
     
@@ -205,16 +351,17 @@ class DataManager:
         if data is None:
             return "{}"
             
-        # Convert DataFrame to JSON format suitable for charting libraries
+        # Convert DataFrame to JSON format suitable for charting libraries.
+        # OHLCV goes out column-wise as NumPy arrays, serialized directly by orjson.
         result = {
             "timestamps": data.index.astype(str).tolist(),
-            "ohlcv": data[['Open', 'High', 'Low', 'Close', 'Volume']].to_dict('records'),
+            "ohlcv": {col: data[col].to_numpy() for col in ['Open', 'High', 'Low', 'Close', 'Volume']},
             "metadata": {
-                "symbol": getattr(self, 'current_symbol', 'UNKNOWN'),
-                "interval": getattr(self, 'current_interval', 'UNKNOWN'),
+                "symbol": self.current_symbol or 'UNKNOWN',
+                "interval": self.current_interval or 'UNKNOWN',
                 "timezone": self.provider.timezone,
                 "last_updated": datetime.now().isoformat()
             }
         }
         
-        return json.dumps(result, default=str)
+        return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY).decode()
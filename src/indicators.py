@@ -3,20 +3,210 @@ Indicators Module - Technical analysis indicators
 Separated from strategy logic for reusability
 """
 
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import orjson
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from scipy.signal import lfilter, lfilter_zi
+from typing import Dict, Any, Hashable, Optional
+
+# Optional JIT compilation (falls back to SciPy lfilter)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback when Numba is not installed: leave functions undecorated"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def ema_loop(values: np.ndarray, alpha: float) -> np.ndarray:
+    """EMA seeded with the first sample, matching pandas ewm(adjust=False)"""
+    out = np.empty_like(values)
+    if values.shape[0] == 0:
+        return out
+    ema = values[0]
+    for i in range(values.shape[0]):
+        ema = alpha * values[i] + (1 - alpha) * ema
+        out[i] = ema
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _macd_kernel(x, af, as_, asig, atrend):
+    """
+    Fast/slow/signal/trend EMA recurrences fused into one pass over the prices
+    
+    Returns MACD, Signal, Histogram, the trend EMA and a mask of bars where
+    the price is above it.
+    """
+    n = x.shape[0]
+    macd = np.empty(n)
+    signal = np.empty(n)
+    hist = np.empty(n)
+    trend = np.empty(n)
+    above = np.empty(n, dtype=np.bool_)
+    if n == 0:
+        return macd, signal, hist, trend, above
+    
+    ef = x[0]
+    es = x[0]
+    et = x[0]
+    sig = 0.0
+    for i in range(n):
+        ef += af * (x[i] - ef)
+        es += as_ * (x[i] - es)
+        m = ef - es
+        sig += asig * (m - sig)
+        et += atrend * (x[i] - et)
+        macd[i] = m
+        signal[i] = sig
+        hist[i] = m - sig
+        trend[i] = et
+        above[i] = x[i] > et
+    return macd, signal, hist, trend, above
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from cache) at import so the first request doesn't pay for it
+    ema_loop(np.zeros(1), 0.1)
+    _macd_kernel(np.zeros(1), 0.1, 0.1, 0.1, 0.1)
+
+
+def _ema_lfilter(values: np.ndarray, alpha: float) -> np.ndarray:
+    """SciPy equivalent of ema_loop for environments without Numba"""
+    if len(values) == 0:
+        return values.copy()
+    # y[n] = alpha * x[n] + (1 - alpha) * y[n-1] as an IIR filter, seeded with x[0]
+    b, a = [alpha], [1.0, alpha - 1.0]
+    return lfilter(b, a, values, zi=lfilter_zi(b, a) * values[0])[0]
+
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average of a float64 array (pandas ewm(span, adjust=False))"""
+    ema = ema_loop if NUMBA_AVAILABLE else _ema_lfilter
+    return ema(values, 2.0 / (span + 1))
+
+
+def _macd_lfilter(x, af, as_, asig, atrend):
+    """SciPy equivalent of _macd_kernel for environments without Numba"""
+    macd = _ema_lfilter(x, af) - _ema_lfilter(x, as_)
+    signal = _ema_lfilter(macd, asig)
+    trend = _ema_lfilter(x, atrend)
+    return macd, signal, macd - signal, trend, x > trend
+
+
+def _wilder_smooth(changes: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (alpha = 1/period) of per-bar changes
+    
+    changes[0] has no previous bar and is ignored; the average is seeded with
+    the mean of the next `period` changes, so the first `period` bars are NaN.
+    """
+    out = np.full(len(changes), np.nan)
+    if len(changes) <= period:
+        return out
+    seed = changes[1:period + 1].mean()
+    out[period] = seed
+    alpha = 1.0 / period
+    b, a = [alpha], [1.0, alpha - 1.0]
+    out[period + 1:] = lfilter(b, a, changes[period + 1:], zi=lfilter_zi(b, a) * seed)[0]
+    return out
+
+
+# Memoized calculate() results and exported JSON, shared by all managers
+CACHE_SIZE = 64
+_calc_cache = OrderedDict()
+_export_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(cache: OrderedDict, key: Hashable) -> Any:
+    """Look up a cached value (None on miss) and mark it recently used"""
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key: Hashable, value: Any) -> None:
+    """Store a value, evicting the least recently used beyond CACHE_SIZE"""
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _data_token(data: pd.DataFrame) -> Hashable:
+    """
+    Cheap fingerprint of a candle frame: shape, time range and the last row
+    
+    Fetched history is immutable except for the (possibly still open) last
+    candle, so these identify the data without hashing every row.
+    """
+    if data.empty:
+        return (0, tuple(data.columns))
+    return (len(data), str(data.index.dtype), data.index[0], data.index[-1],
+            tuple(data.columns), tuple(data.iloc[-1].tolist()))
+
+
+def _calculator_key(calculator: 'IndicatorCalculator') -> Hashable:
+    """Calculator type and parameters"""
+    return (type(calculator), tuple(sorted(vars(calculator).items())))
+
+
+def _memoized(calculate):
+    """Cache calculate(data) per calculator parameters and data fingerprint"""
+    @wraps(calculate)
+    def wrapper(self, data: pd.DataFrame) -> Dict[str, Any]:
+        key = (_calculator_key(self), _data_token(data))
+        result = _cache_get(_calc_cache, key)
+        if result is None:
+            result = calculate(self, data)
+            _cache_put(_calc_cache, key, result)
+        # Callers get their own dict; the Series are shared and must not be modified
+        return dict(result)
+    return wrapper
+
+
+# Price column for each `source` option (unknown sources fall back to Close)
+SOURCE_COLUMNS = {'close': 'Close', 'high': 'High', 'low': 'Low', 'open': 'Open'}
 
 
 class IndicatorCalculator:
     """Base class for technical indicators"""
     
+    # Column indexes already validated, keyed by (id, required columns). The
+    # Index is kept alongside its id so a recycled id can't produce a false hit;
+    # pandas Indexes are immutable, so a passed check stays valid.
+    _cols_seen: Dict[tuple, pd.Index] = {}
+    
     @staticmethod
     def validate_data(data: pd.DataFrame, required_columns: list) -> None:
         """Validate that required columns exist in the data"""
-        missing_cols = [col for col in required_columns if col not in data.columns]
+        columns = data.columns
+        key = (id(columns), tuple(required_columns))
+        seen = IndicatorCalculator._cols_seen
+        if seen.get(key) is columns:
+            return
+        
+        missing_cols = set(required_columns).difference(columns)
         if missing_cols:
-            raise ValueError(f"Missing required columns: {missing_cols}")
+            raise ValueError(f"Missing required columns: {sorted(missing_cols)}")
+        
+        if len(seen) >= CACHE_SIZE:
+            seen.clear()
+        seen[key] = columns
 
 
 class MACDCalculator(IndicatorCalculator):
@@ -24,144 +214,137 @@ class MACDCalculator(IndicatorCalculator):
     
     def __init__(self, fast_length: int = 12, slow_length: int = 26, 
                  signal_smoothing: int = 9, source: str = 'close', 
-                 oscillator_ma_type: str = 'EMA', signal_line_ma_type: str = 'EMA'):
+                 oscillator_ma_type: str = 'EMA', signal_line_ma_type: str = 'EMA',
+                 dtype: type = np.float32, trend_length: Optional[int] = None):
         self.fast_length = fast_length
         self.slow_length = slow_length
         self.signal_smoothing = signal_smoothing
+        # Optional trend EMA (e.g. 200) computed in the same pass as the MACD;
+        # adds EMA_<trend_length> and the Above_Trend mask to the results
+        self.trend_length = trend_length
         self.source = source.lower()
+        self._col = SOURCE_COLUMNS.get(self.source, 'Close')
         self.oscillator_ma_type = oscillator_ma_type.upper()
         self.signal_line_ma_type = signal_line_ma_type.upper()
+        # Output precision; the recurrences always run in float64
+        self.dtype = dtype
     
+    @_memoized
     def calculate(self, data: pd.DataFrame) -> Dict[str, pd.Series]:
         """Calculate MACD indicator"""
         required_columns = ['Open', 'High', 'Low', 'Close']
         self.validate_data(data, required_columns)
         
-        # Select source price
-        if self.source == 'close':
-            source_price = data['Close']
-        elif self.source == 'high':
-            source_price = data['High']
-        elif self.source == 'low':
-            source_price = data['Low']
-        elif self.source == 'open':
-            source_price = data['Open']
-        else:
-            source_price = data['Close']
-        
-        # Calculate EMAs (we'll implement SMA later if needed)
-        if self.oscillator_ma_type == 'EMA':
-            ema_fast = source_price.ewm(span=self.fast_length, adjust=False).mean()
-            ema_slow = source_price.ewm(span=self.slow_length, adjust=False).mean()
-        else:
-            # Default to EMA for now
-            ema_fast = source_price.ewm(span=self.fast_length, adjust=False).mean()
-            ema_slow = source_price.ewm(span=self.slow_length, adjust=False).mean()
-        
-        # Calculate MACD line
-        macd = ema_fast - ema_slow
+        source_price = data[self._col]
         
-        # Calculate Signal line
-        if self.signal_line_ma_type == 'EMA':
-            signal = macd.ewm(span=self.signal_smoothing, adjust=False).mean()
-        else:
-            # Default to EMA for now
-            signal = macd.ewm(span=self.signal_smoothing, adjust=False).mean()
+        # Work on the raw array; Series are only built for the result
+        src = source_price.to_numpy(dtype=np.float64)
         
-        # Calculate Histogram
-        histogram = macd - signal
+        # Only EMA is implemented for both MA types so far (SMA later if needed);
+        # all MACD outputs come from one fused pass over the prices
+        kernel = _macd_kernel if NUMBA_AVAILABLE else _macd_lfilter
+        *outputs, trend, above = kernel(
+            src,
+            2.0 / (self.fast_length + 1),
+            2.0 / (self.slow_length + 1),
+            2.0 / (self.signal_smoothing + 1),
+            2.0 / (self.trend_length + 1) if self.trend_length else 1.0
+        )
         
-        return {
-            'MACD': macd,
-            'Signal': signal,
-            'Histogram': histogram,
-            'MACD_prev': macd.shift(1),
-            'Signal_prev': signal.shift(1)
+        index = data.index
+        names = ('MACD', 'Signal', 'Histogram')
+        result = {
+            name: pd.Series(values.astype(self.dtype, copy=False), index=index, copy=False)
+            for name, values in zip(names, outputs)
         }
+        if self.trend_length:
+            result[f'EMA_{self.trend_length}'] = pd.Series(
+                trend.astype(self.dtype, copy=False), index=index, copy=False
+            )
+            result['Above_Trend'] = pd.Series(above, index=index, copy=False)
+        return result
     
     def get_crossover_signals(self, macd_data: Dict[str, pd.Series]) -> pd.Series:
         """Detect bullish MACD crossover signals"""
-        bullish_cross = (
-            (macd_data['MACD'] > macd_data['Signal']) & 
-            (macd_data['MACD_prev'] <= macd_data['Signal_prev']) &
-            (macd_data['MACD'] < 0) &
-            (macd_data['Signal'] < 0)
-        )
+        m = macd_data['MACD'].to_numpy()
+        s = macd_data['Signal'].to_numpy()
+        
+        # Each bar against the previous one via offset views into the same
+        # arrays; the first bar has no previous bar and never signals
+        bullish_cross = np.zeros(len(m), dtype=bool)
+        current = bullish_cross[1:]
+        np.logical_and(m[1:] > s[1:], m[:-1] <= s[:-1], out=current)
+        current &= m[1:] < 0
+        current &= s[1:] < 0
         
-        return bullish_cross
+        return pd.Series(bullish_cross, index=macd_data['MACD'].index, copy=False)
 
 
 class RSICalculator(IndicatorCalculator):
     """RSI (Relative Strength Index) indicator calculator"""
     
-    def __init__(self, period: int = 14, source: str = 'close'):
+    def __init__(self, period: int = 14, source: str = 'close', dtype: type = np.float32):
         self.period = period
         self.source = source.lower()
+        self._col = 'Close'  # Only close is supported as the RSI source
+        self.dtype = dtype
     
-    def calculate(self, data: pd.DataFrame) -> Dict[str, pd.Series]:
-        """Calculate RSI indicator"""
+    @_memoized
+    def calculate(self, data: pd.DataFrame) -> Dict[str, Any]:
+        """Calculate RSI indicator (overbought/oversold levels as scalars)"""
         required_columns = ['Close']
         self.validate_data(data, required_columns)
         
-        # Select source price
-        if self.source == 'close':
-            source_price = data['Close']
-        else:
-            source_price = data['Close']  # Default to close
+        source_price = data[self._col]
         
         # Calculate price changes
-        delta = source_price.diff()
+        delta = np.diff(source_price.to_numpy(dtype=np.float64), prepend=np.nan)
         
-        # Separate gains and losses
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.period).mean()
+        # Separate gains and losses, smoothed with Wilder's average
+        gain = _wilder_smooth(np.where(delta > 0, delta, 0.0), self.period)
+        loss = _wilder_smooth(np.where(delta < 0, -delta, 0.0), self.period)
         
         # Calculate RSI
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = 100 - 100 / (1 + gain / loss)
+        rsi = pd.Series(values.astype(self.dtype, copy=False), index=source_price.index, copy=False)
         
         return {
             'RSI': rsi,
-            'RSI_Overbought': pd.Series([70] * len(rsi), index=rsi.index),
-            'RSI_Oversold': pd.Series([30] * len(rsi), index=rsi.index)
+            'RSI_Overbought': 70.0,
+            'RSI_Oversold': 30.0
         }
 
 
 class MovingAverageCalculator(IndicatorCalculator):
     """Moving Average calculator (SMA, EMA, etc.)"""
     
-    def __init__(self, period: int = 20, ma_type: str = 'SMA', source: str = 'close'):
+    def __init__(self, period: int = 20, ma_type: str = 'SMA', source: str = 'close',
+                 dtype: type = np.float32):
         self.period = period
         self.ma_type = ma_type.upper()
         self.source = source.lower()
+        self._col = SOURCE_COLUMNS.get(self.source, 'Close')
+        # Anything other than EMA is computed as an SMA
+        self._use_ema = self.ma_type == 'EMA'
+        self.dtype = dtype
     
+    @_memoized
     def calculate(self, data: pd.DataFrame) -> Dict[str, pd.Series]:
         """Calculate moving average"""
         required_columns = ['Close']
         self.validate_data(data, required_columns)
         
-        # Select source price
-        if self.source == 'close':
-            source_price = data['Close']
-        elif self.source == 'high':
-            source_price = data['High']
-        elif self.source == 'low':
-            source_price = data['Low']
-        elif self.source == 'open':
-            source_price = data['Open']
-        else:
-            source_price = data['Close']
+        source_price = data[self._col]
         
-        if self.ma_type == 'SMA':
-            ma = source_price.rolling(window=self.period).mean()
-        elif self.ma_type == 'EMA':
-            ma = source_price.ewm(span=self.period, adjust=False).mean()
+        if self._use_ema:
+            ma = pd.Series(_ema(source_price.to_numpy(dtype=np.float64), self.period),
+                           index=source_price.index)
         else:
-            # Default to SMA
             ma = source_price.rolling(window=self.period).mean()
         
         return {
-            f'{self.ma_type}_{self.period}': ma
+            f'{self.ma_type}_{self.period}': ma.astype(self.dtype, copy=False)
         }
 
 
@@ -171,14 +354,20 @@ class IndicatorManager:
     def __init__(self):
         self.indicators = {}
         self.results = {}
+        # Identifies the current results for the export cache (None: don't cache)
+        self._results_key = None
     
     def add_indicator(self, name: str, calculator: IndicatorCalculator) -> None:
         """Add an indicator calculator"""
         self.indicators[name] = calculator
+        self._results_key = None
     
     def calculate_all(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Calculate all registered indicators"""
         self.results = {}
+        self._results_key = (_data_token(data), tuple(
+            (name, _calculator_key(calculator)) for name, calculator in self.indicators.items()
+        ))
         
         for name, calculator in self.indicators.items():
             try:
@@ -195,22 +384,38 @@ class IndicatorManager:
     
     def export_indicators_json(self) -> str:
         """Export indicator data as JSON for frontend"""
-        import json
+        if self._results_key is not None:
+            cached = _cache_get(_export_cache, self._results_key)
+            if cached is not None:
+                return cached
         
         export_data = {}
         
         for indicator_name, indicator_data in self.results.items():
             export_data[indicator_name] = {}
+            # Series in one indicator group normally share an index
+            index = None
+            timestamps = None
             
             for series_name, series_data in indicator_data.items():
                 if isinstance(series_data, pd.Series):
-                    # Convert NaN values to None for JSON serialization
-                    values_list = series_data.tolist()
-                    values_list = [None if pd.isna(x) else x for x in values_list]
+                    if series_data.index is not index:
+                        index = series_data.index
+                        timestamps = index.astype(str).tolist()
                     
                     export_data[indicator_name][series_name] = {
-                        'values': values_list,
-                        'timestamps': series_data.index.astype(str).tolist()
+                        # Serialized directly by orjson, NaN as null
+                        'values': series_data.to_numpy(),
+                        'timestamps': timestamps
+                    }
+                elif isinstance(series_data, (int, float)):
+                    # Constant levels (e.g. RSI 70/30) are drawn as horizontal lines
+                    export_data[indicator_name][series_name] = {
+                        'value': series_data,
+                        'constant': True
                     }
         
-        return json.dumps(export_data, default=str)
+        exported = orjson.dumps(export_data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        if self._results_key is not None:
+            _cache_put(_export_cache, self._results_key, exported)
+        return exported
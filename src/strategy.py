@@ -7,11 +7,185 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, asdict
-import json
+from dataclasses import dataclass
+import orjson
 
+# Optional JIT compilation for the exit scan (falls back to NumPy)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback when Numba is not installed: leave functions undecorated"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+EXIT_REASONS = ('Take Profit', 'Stop Loss', 'End of Period')
 
-@dataclass
+
+@njit(cache=True)
+def _scan_exits(close, entries, tp, sl):
+    """
+    Find the TP/SL exit of each trade opened on an entry signal
+    
+    Scans bar by bar from each entry until the return crosses TP or SL, then
+    resumes at the first signal on or after the exit bar (a signal on the
+    exit bar opens the next trade, like the per-bar update-then-enter order).
+    Returns entry/exit bar indices and reason codes (indices into EXIT_REASONS).
+    """
+    n = close.shape[0]
+    m = entries.shape[0]
+    entry_idx = np.empty(m, dtype=np.int64)
+    exit_idx = np.empty(m, dtype=np.int64)
+    reason = np.empty(m, dtype=np.int8)
+    
+    count = 0
+    k = 0
+    while k < m:
+        entry_i = entries[k]
+        entry_price = close[entry_i]
+        exit_i = n - 1
+        code = 2
+        for j in range(entry_i + 1, n):
+            return_pct = (close[j] - entry_price) / entry_price
+            if return_pct >= tp:
+                exit_i = j
+                code = 0
+                break
+            if return_pct <= -sl:
+                exit_i = j
+                code = 1
+                break
+        
+        entry_idx[count] = entry_i
+        exit_idx[count] = exit_i
+        reason[count] = code
+        count += 1
+        if code == 2:
+            break
+        
+        while k < m and entries[k] < exit_i:
+            k += 1
+    
+    return entry_idx[:count], exit_idx[:count], reason[:count]
+
+
+def _scan_exits_numpy(close: np.ndarray, entries: np.ndarray, tp: float, sl: float):
+    """
+    NumPy equivalent of _scan_exits for environments without Numba
+    
+    The first TP/SL hit after each entry is found with array comparisons over
+    growing windows of the remaining prices, and signals inside an open trade
+    are skipped via searchsorted.
+    """
+    n = close.shape[0]
+    entry_idx = np.empty(entries.size, dtype=np.int64)
+    exit_idx = np.empty(entries.size, dtype=np.int64)
+    reason = np.empty(entries.size, dtype=np.int8)
+    
+    count = 0
+    k = 0
+    while k < entries.size:
+        entry_i = entries[k]
+        entry_price = close[entry_i]
+        exit_i = n - 1
+        code = 2
+        
+        start = entry_i + 1
+        width = 64
+        while start < n:
+            returns = (close[start:start + width] - entry_price) / entry_price
+            tp_hit = returns >= tp
+            hit = tp_hit | (returns <= -sl)
+            if hit.any():
+                j = int(np.argmax(hit))
+                exit_i = start + j
+                code = 0 if tp_hit[j] else 1
+                break
+            start += width
+            width *= 2
+        
+        entry_idx[count] = entry_i
+        exit_idx[count] = exit_i
+        reason[count] = code
+        count += 1
+        if code == 2:
+            break
+        
+        # Next entry can be on this trade's exit bar, but not before it
+        k = int(np.searchsorted(entries, exit_i, side='left'))
+    
+    return entry_idx[:count], exit_idx[:count], reason[:count]
+
+
+def _vectorized_backtest(close: np.ndarray, signals: np.ndarray, tp: float, sl: float):
+    """Simulate long-only trades entered on signals and closed on TP/SL"""
+    entries = np.flatnonzero(signals)
+    scan = _scan_exits if NUMBA_AVAILABLE else _scan_exits_numpy
+    return scan(close, entries, tp, sl)
+
+
+@njit(cache=True)
+def _perf_kernel(returns, exit_reason):
+    """
+    Trade statistics in a single pass over the return column
+    
+    Returns wins, TP hits, SL hits, sum, best, worst, mean, population std
+    (Welford) and max drawdown of the compounded equity curve.
+    """
+    wins = 0
+    tp_hits = 0
+    sl_hits = 0
+    total = 0.0
+    best = -np.inf
+    worst = np.inf
+    mean = 0.0
+    m2 = 0.0
+    equity = 1.0
+    peak = -np.inf
+    max_drawdown = 0.0
+    for i in range(returns.shape[0]):
+        r = returns[i]
+        if r > 0:
+            wins += 1
+        if exit_reason[i] == 0:
+            tp_hits += 1
+        elif exit_reason[i] == 1:
+            sl_hits += 1
+        total += r
+        best = max(best, r)
+        worst = min(worst, r)
+        
+        delta = r - mean
+        mean += delta / (i + 1)
+        m2 += delta * (r - mean)
+        
+        equity *= 1 + r
+        peak = max(peak, equity)
+        max_drawdown = min(max_drawdown, (equity - peak) / peak)
+    
+    std = np.sqrt(m2 / returns.shape[0]) if returns.shape[0] > 0 else 0.0
+    return wins, tp_hits, sl_hits, total, best, worst, mean, std, max_drawdown
+
+
+def _perf_numpy(returns: np.ndarray, exit_reason: np.ndarray):
+    """NumPy equivalent of _perf_kernel for environments without Numba"""
+    equity = np.cumprod(1 + returns)
+    peak = np.maximum.accumulate(equity)
+    return (
+        int(np.count_nonzero(returns > 0)),
+        int(np.count_nonzero(exit_reason == 0)),
+        int(np.count_nonzero(exit_reason == 1)),
+        returns.sum(), returns.max(), returns.min(), returns.mean(), returns.std(),
+        ((equity - peak) / peak).min()
+    )
+
+
+@dataclass(slots=True)
 class Trade:
     """Trade data structure"""
     entry_date: datetime
@@ -24,10 +198,18 @@ class Trade:
     
     def to_dict(self) -> Dict:
         """Convert trade to dictionary"""
-        return asdict(self)
+        return {
+            'entry_date': self.entry_date,
+            'entry_price': self.entry_price,
+            'exit_date': self.exit_date,
+            'exit_price': self.exit_price,
+            'return_pct': self.return_pct,
+            'exit_reason': self.exit_reason,
+            'position_size': self.position_size
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Current position data structure"""
     symbol: str
@@ -36,6 +218,169 @@ class Position:
     entry_date: datetime
     size: float = 1.0
     unrealized_pnl: float = 0.0
+    
+    def to_dict(self) -> Dict:
+        """Convert position to dictionary"""
+        return {
+            'symbol': self.symbol,
+            'side': self.side,
+            'entry_price': self.entry_price,
+            'entry_date': self.entry_date,
+            'size': self.size,
+            'unrealized_pnl': self.unrealized_pnl
+        }
+
+
+class TradeStore:
+    """
+    Closed trades stored column-wise, one NumPy array per Trade field
+    
+    Dates are kept as int64 nanoseconds since the epoch (UTC) plus the
+    timezone they were recorded in, exit reasons as int8 codes into
+    `reasons`. Trade objects and dicts are only built when requested.
+    """
+    
+    def __init__(self, capacity: int = 64):
+        self.n = 0
+        self.tz = None
+        self.reasons: List[str] = list(EXIT_REASONS)
+        self._entry_ts = np.empty(capacity, dtype=np.int64)
+        self._exit_ts = np.empty(capacity, dtype=np.int64)
+        self._entry_px = np.empty(capacity, dtype=np.float64)
+        self._exit_px = np.empty(capacity, dtype=np.float64)
+        self._return_pct = np.empty(capacity, dtype=np.float64)
+        self._exit_reason = np.empty(capacity, dtype=np.int8)
+        self._position_size = np.empty(capacity, dtype=np.float64)
+        # to_dicts() result, rebuilt only after new trades are recorded
+        self._dicts: Optional[List[Dict]] = None
+    
+    entry_ts = property(lambda self: self._entry_ts[:self.n])
+    exit_ts = property(lambda self: self._exit_ts[:self.n])
+    entry_px = property(lambda self: self._entry_px[:self.n])
+    exit_px = property(lambda self: self._exit_px[:self.n])
+    return_pct = property(lambda self: self._return_pct[:self.n])
+    exit_reason = property(lambda self: self._exit_reason[:self.n])
+    position_size = property(lambda self: self._position_size[:self.n])
+    
+    def __len__(self) -> int:
+        return self.n
+    
+    def __getitem__(self, i: int) -> Trade:
+        if not -self.n <= i < self.n:
+            raise IndexError("trade index out of range")
+        i %= self.n
+        return Trade(
+            entry_date=self._timestamp(self._entry_ts[i]),
+            entry_price=float(self._entry_px[i]),
+            exit_date=self._timestamp(self._exit_ts[i]),
+            exit_price=float(self._exit_px[i]),
+            return_pct=float(self._return_pct[i]),
+            exit_reason=self.reasons[self._exit_reason[i]],
+            position_size=float(self._position_size[i])
+        )
+    
+    def __iter__(self):
+        return (self[i] for i in range(self.n))
+    
+    def reason_code(self, reason: str) -> int:
+        """Code of an exit reason, registering reasons beyond EXIT_REASONS"""
+        try:
+            return self.reasons.index(reason)
+        except ValueError:
+            self.reasons.append(reason)
+            return len(self.reasons) - 1
+    
+    def _reserve(self, extra: int) -> None:
+        """Grow the columns (doubling) to fit `extra` more trades"""
+        needed = self.n + extra
+        capacity = len(self._return_pct)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for name in ('_entry_ts', '_exit_ts', '_entry_px', '_exit_px',
+                     '_return_pct', '_exit_reason', '_position_size'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+    
+    def _epoch_ns(self, date: datetime) -> int:
+        ts = pd.Timestamp(date)
+        if self.n == 0:
+            self.tz = ts.tz
+        return ts.as_unit('ns').value
+    
+    def _timestamp(self, value: int) -> pd.Timestamp:
+        return pd.Timestamp(int(value), tz=self.tz)
+    
+    def _dates(self, values: np.ndarray) -> pd.DatetimeIndex:
+        dates = pd.DatetimeIndex(values.view('datetime64[ns]'))
+        return dates.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else dates
+    
+    def append(self, trade: Trade) -> None:
+        """Record one closed trade"""
+        self._reserve(1)
+        i = self.n
+        self._entry_ts[i] = self._epoch_ns(trade.entry_date)
+        self._exit_ts[i] = self._epoch_ns(trade.exit_date)
+        self._entry_px[i] = trade.entry_price
+        self._exit_px[i] = trade.exit_price
+        self._return_pct[i] = trade.return_pct
+        self._exit_reason[i] = self.reason_code(trade.exit_reason)
+        self._position_size[i] = trade.position_size
+        self.n += 1
+        self._dicts = None
+    
+    def extend(self, entry_dates: pd.DatetimeIndex, exit_dates: pd.DatetimeIndex,
+               entry_px: np.ndarray, exit_px: np.ndarray, return_pct: np.ndarray,
+               exit_reason: np.ndarray, position_size: float = 1.0) -> None:
+        """Record a batch of closed trades from column arrays"""
+        k = len(return_pct)
+        if k == 0:
+            return
+        if self.n == 0:
+            self.tz = entry_dates.tz
+        self._reserve(k)
+        rows = slice(self.n, self.n + k)
+        self._entry_ts[rows] = entry_dates.as_unit('ns').asi8
+        self._exit_ts[rows] = exit_dates.as_unit('ns').asi8
+        self._entry_px[rows] = entry_px
+        self._exit_px[rows] = exit_px
+        self._return_pct[rows] = return_pct
+        self._exit_reason[rows] = exit_reason
+        self._position_size[rows] = position_size
+        self.n += k
+        self._dicts = None
+    
+    def to_dicts(self) -> List[Dict]:
+        """
+        All trades as Trade.to_dict()-style dictionaries
+        
+        The list is built once and shared by later calls until another trade
+        is recorded, so callers must not modify it.
+        """
+        if self._dicts is not None:
+            return self._dicts
+        
+        reasons = self.reasons
+        self._dicts = [
+            {
+                'entry_date': entry_date,
+                'entry_price': entry_price,
+                'exit_date': exit_date,
+                'exit_price': exit_price,
+                'return_pct': return_pct,
+                'exit_reason': reasons[code],
+                'position_size': size
+            }
+            for entry_date, entry_price, exit_date, exit_price, return_pct, code, size in zip(
+                self._dates(self.entry_ts), self.entry_px.tolist(),
+                self._dates(self.exit_ts), self.exit_px.tolist(),
+                self.return_pct.tolist(), self.exit_reason.tolist(),
+                self.position_size.tolist()
+            )
+        ]
+        return self._dicts
 
 
 class RiskManager:
@@ -80,7 +425,7 @@ class BaseStrategy:
         self.symbol = symbol
         self.risk_manager = risk_manager or RiskManager()
         self.current_position: Optional[Position] = None
-        self.trades: List[Trade] = []
+        self.trades = TradeStore()
         self.on_trade_callback: Optional[Callable] = None
         self.on_position_callback: Optional[Callable] = None
     
@@ -156,27 +501,38 @@ class BaseStrategy:
         
         return None
     
-    def backtest(self, data: pd.DataFrame, indicators: Dict) -> List[Trade]:
+    def backtest(self, data: pd.DataFrame, indicators: Dict) -> TradeStore:
         """Run backtest on historical data"""
         signals = self.generate_signals(data, indicators)
         
-        for i in range(len(data)):
-            current_date = data.index[i]
-            current_price = float(data['Close'].iloc[i])
-            current_signal = bool(signals.iloc[i]) if not pd.isna(signals.iloc[i]) else False
-            
-            # Update existing position
-            trade = self.update_position(current_price, current_date)
-            
-            # Check for new entry signals
-            if self.current_position is None and current_signal:
-                self.enter_position('long', current_price, current_date)
-        
-        # Close any remaining position at the end
-        if self.current_position is not None:
-            final_price = float(data['Close'].iloc[-1])
-            final_date = data.index[-1]
-            self.exit_position(final_price, final_date, "End of Period")
+        close = data['Close'].to_numpy(dtype=np.float64)
+        signals = signals.to_numpy(dtype=bool, na_value=False)
+        entry_idx, exit_idx, reason = _vectorized_backtest(
+            close, signals, self.risk_manager.take_profit, self.risk_manager.stop_loss
+        )
+        
+        # Record all trades at once from the index arrays
+        dates = data.index
+        entry_price = close[entry_idx]
+        exit_price = close[exit_idx]
+        first = len(self.trades)
+        self.trades.extend(
+            dates[entry_idx], dates[exit_idx], entry_price, exit_price,
+            (exit_price - entry_price) / entry_price, reason
+        )
+        
+        if self.on_position_callback or self.on_trade_callback:
+            for k in range(first, len(self.trades)):
+                trade = self.trades[k]
+                if self.on_position_callback:
+                    self.on_position_callback(Position(
+                        symbol=self.symbol,
+                        side='long',
+                        entry_price=trade.entry_price,
+                        entry_date=trade.entry_date
+                    ))
+                if self.on_trade_callback:
+                    self.on_trade_callback(trade)
         
         return self.trades
     
@@ -196,34 +552,29 @@ class BaseStrategy:
                 'max_drawdown': 0
             }
         
-        returns = [trade.return_pct for trade in self.trades]
-        winning_trades = [r for r in returns if r > 0]
-        losing_trades = [r for r in returns if r <= 0]
-        
-        # Calculate cumulative returns for drawdown
-        cumulative_returns = np.cumprod([1 + r for r in returns])
-        running_max = np.maximum.accumulate(cumulative_returns)
-        drawdowns = (cumulative_returns - running_max) / running_max
-        max_drawdown = np.min(drawdowns) if len(drawdowns) > 0 else 0
+        n_trades = len(self.trades)
+        perf = _perf_kernel if NUMBA_AVAILABLE else _perf_numpy
+        (winning_trades, tp_hits, sl_hits, total_return, best, worst,
+         mean_return, std_return, max_drawdown) = perf(self.trades.return_pct, self.trades.exit_reason)
         
         # Sharpe ratio (simplified - assuming daily returns)
-        mean_return = np.mean(returns) if returns else 0
-        std_return = np.std(returns) if len(returns) > 1 else 0
+        if n_trades < 2:
+            std_return = 0
         sharpe_ratio = mean_return / std_return if std_return > 0 else 0
         
         performance = {
-            'total_trades': len(self.trades),
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
-            'win_rate': len(winning_trades) / len(self.trades) * 100,
-            'total_return': sum(returns) * 100,
-            'average_return': mean_return * 100,
-            'best_trade': max(returns) * 100 if returns else 0,
-            'worst_trade': min(returns) * 100 if returns else 0,
-            'sharpe_ratio': sharpe_ratio * np.sqrt(252),  # Annualized
-            'max_drawdown': max_drawdown * 100,
-            'take_profit_hits': len([t for t in self.trades if t.exit_reason == 'Take Profit']),
-            'stop_loss_hits': len([t for t in self.trades if t.exit_reason == 'Stop Loss'])
+            'total_trades': n_trades,
+            'winning_trades': int(winning_trades),
+            'losing_trades': n_trades - int(winning_trades),
+            'win_rate': winning_trades / n_trades * 100,
+            'total_return': float(total_return) * 100,
+            'average_return': float(mean_return) * 100,
+            'best_trade': float(best) * 100,
+            'worst_trade': float(worst) * 100,
+            'sharpe_ratio': float(sharpe_ratio * np.sqrt(252)),  # Annualized
+            'max_drawdown': float(max_drawdown) * 100,
+            'take_profit_hits': int(tp_hits),
+            'stop_loss_hits': int(sl_hits)
         }
         
         return performance
@@ -244,25 +595,29 @@ class MACDStrategy(BaseStrategy):
         if not macd_data:
             return pd.Series([False] * len(data), index=data.index)
         
-        # MACD crossover above signal line while both below zero
-        macd_cross = (
-            (macd_data['MACD'] > macd_data['Signal']) & 
-            (macd_data['MACD_prev'] <= macd_data['Signal_prev']) &
-            (macd_data['MACD'] < 0) &
-            (macd_data['Signal'] < 0)
-        )
+        m = macd_data['MACD'].to_numpy()
+        s = macd_data['Signal'].to_numpy()
+        
+        # MACD crossover above signal line while both below zero, comparing
+        # each bar with the previous one via offset views (none on the first bar)
+        bullish_cross = np.zeros(len(m), dtype=bool)
+        current = bullish_cross[1:]
+        np.logical_and(m[1:] > s[1:], m[:-1] <= s[:-1], out=current)
+        current &= m[1:] < 0
+        current &= s[1:] < 0
         
         # 200 EMA trend filter - only trade when price is above 200 EMA
-        if ema_200_data and 'EMA_200' in ema_200_data:
-            price_above_ema200 = data['Close'] > ema_200_data['EMA_200']
+        if 'Above_Trend' in macd_data:
+            # Mask computed alongside the MACD (MACDCalculator(trend_length=200))
+            bullish_cross &= macd_data['Above_Trend'].to_numpy()
+        elif ema_200_data and 'EMA_200' in ema_200_data:
             # Combine MACD signal with EMA filter
-            bullish_cross = macd_cross & price_above_ema200
+            bullish_cross &= data['Close'].to_numpy() > ema_200_data['EMA_200'].to_numpy()
         else:
             # Fallback to MACD only if 200 EMA not available
             print("Warning: 200 EMA not available, using MACD signals only")
-            bullish_cross = macd_cross
         
-        return bullish_cross
+        return pd.Series(bullish_cross, index=data.index, copy=False)
 
 
 class StrategyEngine:
@@ -281,7 +636,7 @@ class StrategyEngine:
         performance = self.strategy.calculate_performance()
         
         return {
-            'trades': [trade.to_dict() for trade in trades],
+            'trades': trades.to_dicts(),
             'performance': performance,
             'strategy_name': self.strategy.strategy_name,
             'symbol': self.strategy.symbol
@@ -318,7 +673,7 @@ class StrategyEngine:
     
     def export_results_json(self) -> str:
         """Export strategy results as JSON for frontend"""
-        trades = [trade.to_dict() for trade in self.strategy.trades]
+        trades = self.strategy.trades.to_dicts()
         performance = self.strategy.calculate_performance()
         
         result = {
@@ -330,4 +685,5 @@ class StrategyEngine:
             'timestamp': datetime.now().isoformat()
         }
         
-        return json.dumps(result, default=str)
+        # Timestamps are written with str(), as before
+        return orjson.dumps(result, default=str).decode()
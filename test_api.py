@@ -10,10 +10,14 @@ import time
 # API base URL
 BASE_URL = "http://localhost:5000"
 
+# One keep-alive connection for the whole run
+session = requests.Session()
+session.headers.update({'Content-Type': 'application/json'})
+
 def test_health():
     """Test health endpoint"""
     print("🏥 Testing Health Endpoint...")
-    response = requests.get(f"{BASE_URL}/api/health")
+    response = session.get(f"{BASE_URL}/api/health")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     print()
@@ -21,7 +25,7 @@ def test_health():
 def test_symbols():
     """Test symbols endpoint"""
     print("📈 Testing Symbols Endpoint...")
-    response = requests.get(f"{BASE_URL}/api/symbols")
+    response = session.get(f"{BASE_URL}/api/symbols")
     print(f"Status: {response.status_code}")
     data = response.json()
     print(f"Available symbols: {len(data['symbols'])}")
@@ -31,7 +35,7 @@ def test_symbols():
 def test_intervals():
     """Test intervals endpoint"""
     print("⏰ Testing Intervals Endpoint...")
-    response = requests.get(f"{BASE_URL}/api/intervals")
+    response = session.get(f"{BASE_URL}/api/intervals")
     print(f"Status: {response.status_code}")
     data = response.json()
     print(f"Available intervals: {len(data['intervals'])}")
@@ -53,10 +57,9 @@ def test_backtest():
         "signal_smoothing": 9
     }
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/backtest/ROSEUSDT/5m",
-        json=backtest_config,
-        headers={'Content-Type': 'application/json'}
+        json=backtest_config
     )
     
     print(f"Status: {response.status_code}")
@@ -81,21 +84,31 @@ def test_stream_start():
         "timezone": "Asia/Singapore"
     }
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api/stream/start",
-        json=stream_config,
-        headers={'Content-Type': 'application/json'}
+        json=stream_config
     )
     
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     print()
 
+def wait_for_first_candle(timeout: float = 2.0):
+    """Poll the stream status until a candle has been received (or timeout)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = session.get(f"{BASE_URL}/api/stream/status").json()
+        if status.get('received_candles', 0) > 0:
+            print("📨 First candle received")
+            return
+        time.sleep(0.1)
+    print(f"⌛ No candle within {timeout:.0f}s")
+
 def test_stream_stop():
     """Test stop streaming endpoint"""
     print("⏹️ Testing Stop Stream Endpoint...")
     
-    response = requests.post(f"{BASE_URL}/api/stream/stop")
+    response = session.post(f"{BASE_URL}/api/stream/stop")
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
     print()
@@ -115,7 +128,7 @@ if __name__ == "__main__":
         
         # Streaming tests
         test_stream_start()
-        time.sleep(2)  # Let it run briefly
+        wait_for_first_candle()
         test_stream_stop()
         
         print("✅ All tests completed!")
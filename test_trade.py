@@ -1,8 +1,331 @@
+import os
+import hashlib
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
+import matplotlib
+matplotlib.use('Agg')  # Charts are only saved to disk
 import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+# Optional JIT compilation (falls back to SciPy/NumPy implementations)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels still run as plain Python"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Optional process pool for multi-symbol runs (falls back to a sequential loop)
+try:
+    from joblib import Parallel, delayed
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+
+# Explicit signatures compile the kernels eagerly at import (or load them from
+# the on-disk cache) instead of on the first call of each backtest process.
+# Array inputs are typed read-only so that both ordinary arrays and pandas'
+# copy-on-write column views match
+_F4 = "Array(float32, 1, 'C', readonly=True)"
+_F8 = "Array(float64, 1, 'C', readonly=True)"
+_B1 = "Array(boolean, 1, 'C', readonly=True)"
+
+
+@njit([f'({_F4}, float32, float32, float32)',
+       f'({_F8}, float64, float64, float64)'], cache=True, fastmath=True)
+def _macd_kernel(close, a_fast, a_slow, a_sig):
+    """
+    Single-pass MACD: fast/slow EMAs, MACD line, signal line and bullish
+    crossover (MACD crosses above Signal while both are below zero)
+    
+    Computes in the dtype of close; pass the alphas in the same dtype so
+    float32 input stays float32 throughout.
+    """
+    n = close.shape[0]
+    macd = np.empty(n, dtype=close.dtype)
+    signal = np.empty(n, dtype=close.dtype)
+    cross = np.empty(n, dtype=np.bool_)
+    if n == 0:
+        return macd, signal, cross
+    
+    # Seed with the first sample, matching pandas ewm(adjust=False); the
+    # first MACD value is zero, which also seeds the signal line
+    ef = close[0]
+    es = close[0]
+    sg = ef - es
+    prev_macd = sg
+    prev_signal = sg
+    for i in range(n):
+        # EMA_t = EMA_t-1 + a * (X_t - EMA_t-1), free of float64 literals
+        ef += a_fast * (close[i] - ef)
+        es += a_slow * (close[i] - es)
+        macd_i = ef - es
+        sg += a_sig * (macd_i - sg)
+        macd[i] = macd_i
+        signal[i] = sg
+        # No previous bar on the first sample, so it can never be a crossover
+        cross[i] = (i > 0 and macd_i > sg and prev_macd <= prev_signal
+                    and macd_i < 0 and sg < 0)
+        prev_macd = macd_i
+        prev_signal = sg
+    return macd, signal, cross
+
+
+def _ema_lfilter(x, alpha):
+    """EMA as an IIR filter, seeded with the first sample like pandas ewm(adjust=False)"""
+    if len(x) == 0:
+        return x.copy()
+    # Coefficients in the input dtype keep lfilter from upcasting float32 data
+    b = np.array([alpha], dtype=x.dtype)
+    a = np.array([1.0, alpha - 1.0], dtype=x.dtype)
+    return lfilter(b, a, x, zi=(1 - alpha) * x[:1])[0]
+
+
+def _macd_lfilter(close, a_fast, a_slow, a_sig):
+    """SciPy equivalent of _macd_kernel for environments without Numba"""
+    macd = _ema_lfilter(close, a_fast) - _ema_lfilter(close, a_slow)
+    signal = _ema_lfilter(macd, a_sig)
+    
+    # A cross is the histogram turning positive; MACD > Signal with MACD < 0
+    # already implies Signal < 0, so one more comparison covers "below zero"
+    above = macd - signal > 0
+    cross = np.zeros(len(close), dtype=np.bool_)
+    np.logical_and(above[1:], ~above[:-1], out=cross[1:])
+    cross[1:] &= macd[1:] < 0
+    return macd, signal, cross
+
+
+# Exit reason codes returned by the backtest kernels
+EXIT_REASONS = ('Take Profit', 'Stop Loss', 'End of Period')
+
+# One record per trade: entry/exit bar indices, prices, return and reason code
+TRADE_DTYPE = np.dtype([
+    ('entry_idx', 'i8'),
+    ('exit_idx', 'i8'),
+    ('entry_px', 'f8'),
+    ('exit_px', 'f8'),
+    ('ret', 'f8'),
+    ('reason', 'u1')
+])
+
+
+@njit([f'({_F8}, {_B1}, float64, float64)'], cache=True)
+def _run_backtest(close, cross, tp, sl):
+    """
+    Long-only TP/SL backtest over raw arrays as one compiled state machine
+    
+    Returns entry/exit bar indices, returns and reason codes (indices into
+    EXIT_REASONS), like _resolve_trades.
+    """
+    n = close.shape[0]
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    ret = np.empty(n)
+    reason = np.empty(n, dtype=np.uint8)
+    
+    count = 0
+    position = False
+    entry_i = 0
+    entry_price = 0.0
+    for i in range(n):
+        if not position:
+            if cross[i]:
+                position = True
+                entry_i = i
+                entry_price = close[i]
+        else:
+            returns = (close[i] - entry_price) / entry_price
+            if returns >= tp:
+                code = 0
+            elif returns <= -sl:
+                code = 1
+            else:
+                continue
+            entry_idx[count] = entry_i
+            exit_idx[count] = i
+            ret[count] = returns
+            reason[count] = code
+            count += 1
+            position = False
+    
+    # Close any open position at the end
+    if position:
+        entry_idx[count] = entry_i
+        exit_idx[count] = n - 1
+        ret[count] = (close[n - 1] - entry_price) / entry_price
+        reason[count] = 2
+        count += 1
+    
+    return entry_idx[:count], exit_idx[:count], ret[:count], reason[:count]
+
+
+# Above this fraction of signal bars the compiled loop beats per-entry NumPy scans
+SPARSE_SIGNAL_DENSITY = 0.05
+
+
+# Bars after each entry checked for TP/SL in the all-entries pass of
+# _resolve_trades, and entries per pass (bounds the window matrix to ~2 MB)
+HIT_WINDOW = 64
+ENTRY_BLOCK = 4096
+
+
+def _first_hits(close, entries, tp, sl):
+    """
+    First TP/SL hit within HIT_WINDOW bars after every entry at once
+    
+    Each entry's following bars are a row of a strided window view, so all
+    entries are checked with one comparison per block. Returns exit bar
+    indices (-1 where nothing hit inside the window) and reason codes.
+    """
+    # NaN padding past the last bar never compares as a hit
+    padded = np.concatenate((close, np.full(HIT_WINDOW, np.nan)))
+    windows = sliding_window_view(padded, HIT_WINDOW)
+    exits = np.full(entries.size, -1, dtype=np.int64)
+    codes = np.full(entries.size, 2, dtype=np.uint8)
+    for lo in range(0, entries.size, ENTRY_BLOCK):
+        block = entries[lo:lo + ENTRY_BLOCK]
+        entry_price = close[block, None]
+        returns = (windows[block + 1] - entry_price) / entry_price
+        tp_hit = returns >= tp
+        hit = tp_hit | (returns <= -sl)
+        first = hit.argmax(axis=1)
+        rows = np.arange(block.size)
+        found = hit[rows, first]
+        exits[lo:lo + block.size] = np.where(found, block + 1 + first, -1)
+        codes[lo:lo + block.size] = np.where(found, np.where(tp_hit[rows, first], 0, 1), 2)
+    return exits, codes
+
+
+def _resolve_trades(close, cross, tp, sl):
+    """
+    Long-only TP/SL backtest over raw arrays
+    
+    Works on entry signals instead of bars: the first TP/SL hit of every
+    entry within HIT_WINDOW bars is found in one vectorized pass, and the few
+    trades that last longer are scanned with NumPy comparisons over growing
+    windows of the remaining prices. Signals inside an open trade (or on its
+    exit bar) are then skipped with searchsorted. Returns entry/exit bar
+    indices, returns and reason codes (indices into EXIT_REASONS).
+    """
+    n = close.shape[0]
+    entries = np.flatnonzero(cross)
+    exits, codes = _first_hits(close, entries, tp, sl)
+    entry_idx = np.empty(entries.size, dtype=np.int64)
+    exit_idx = np.empty(entries.size, dtype=np.int64)
+    ret = np.empty(entries.size)
+    reason = np.empty(entries.size, dtype=np.uint8)
+    
+    count = 0
+    k = 0
+    while k < entries.size:
+        entry_i = entries[k]
+        entry_price = close[entry_i]
+        exit_i = exits[k]
+        code = codes[k]
+        
+        if exit_i < 0:
+            exit_i = n - 1
+            start = entry_i + 1 + HIT_WINDOW
+            width = 2 * HIT_WINDOW
+            while start < n:
+                returns = (close[start:start + width] - entry_price) / entry_price
+                tp_hit = returns >= tp
+                hit = tp_hit | (returns <= -sl)
+                if hit.any():
+                    j = int(np.argmax(hit))
+                    exit_i = start + j
+                    code = 0 if tp_hit[j] else 1
+                    break
+                start += width
+                width *= 2
+        
+        entry_idx[count] = entry_i
+        exit_idx[count] = exit_i
+        ret[count] = (close[exit_i] - entry_price) / entry_price
+        reason[count] = code
+        count += 1
+        
+        # Next entry must come after this trade's exit bar
+        k = int(np.searchsorted(entries, exit_i, side='right'))
+    
+    return entry_idx[:count], exit_idx[:count], ret[:count], reason[:count]
+
+
+@njit(['(float32[:, ::1], float64[:, ::1], float32, float32, float32, float64, float64)'],
+      parallel=True, cache=True)
+def _sweep_symbols(src, close, a_fast, a_slow, a_sig, tp, sl):
+    """
+    Run MACD and the backtest for every row (symbol) of a price matrix in parallel
+    
+    src holds the float32 prices for the indicators and close the float64
+    prices for the trades. Returns (total_return, win_rate, n_trades) arrays,
+    one entry per row; rows share nothing, so they run on separate threads.
+    """
+    n_symbols = close.shape[0]
+    total_return = np.zeros(n_symbols)
+    win_rate = np.zeros(n_symbols)
+    n_trades = np.zeros(n_symbols, dtype=np.int64)
+    for s in prange(n_symbols):
+        cross = _macd_kernel(src[s], a_fast, a_slow, a_sig)[2]
+        ret = _run_backtest(close[s], cross, tp, sl)[2]
+        count = ret.shape[0]
+        if count == 0:
+            continue
+        total = 0.0
+        wins = 0
+        for t in range(count):
+            total += ret[t]
+            if ret[t] > 0:
+                wins += 1
+        total_return[s] = total * 100
+        win_rate[s] = wins / count * 100
+        n_trades[s] = count
+    return total_return, win_rate, n_trades
+
+
+def _download_close(symbols, start_date, end_date):
+    """
+    Download Close prices for one or more symbols in a single threaded request
+    
+    Returns a dict of single-column ('Close') DataFrames keyed by symbol;
+    symbols without data are left out.
+    """
+    data = yf.download(symbols, start=start_date, end=end_date,
+                       progress=False, auto_adjust=False, threads=True)
+    if data.empty:
+        return {}
+    
+    # Columns are (field, ticker) pairs, except on older yfinance releases
+    # that return flat columns for a single symbol
+    close = data['Close']
+    if isinstance(close, pd.Series):
+        close = close.to_frame(symbols[0])
+    return {
+        sym: close[[sym]].dropna().set_axis(['Close'], axis=1)
+        for sym in symbols if sym in close.columns
+    }
+
+
+def _run_symbol(symbol, start_date, end_date, kwargs, data=None):
+    """Run one symbol, returning the exception instead of raising so a batch keeps going"""
+    try:
+        strategy = MACDTradingStrategy(symbol, start_date, end_date, **kwargs)
+        strategy.data = data
+        return symbol, strategy.run()
+    except Exception as e:
+        return symbol, e
+
 
 class MACDTradingStrategy:
     """
@@ -11,7 +334,14 @@ class MACDTradingStrategy:
     - Exit: 2% take profit or 1% stop loss
     """
     
-    def __init__(self, symbol, start_date, end_date, fast_period=12, slow_period=26, signal_period=9):
+    # MACD results shared by every instance, so runs that only change TP/SL
+    # (e.g. parameter sweeps) skip the indicator pass; least recently used
+    # entries are evicted beyond MACD_CACHE_SIZE
+    MACD_CACHE_SIZE = 64
+    _macd_cache = OrderedDict()
+    
+    def __init__(self, symbol, start_date, end_date, fast_period=12, slow_period=26, signal_period=9,
+                 cache_dir=os.path.join(os.path.expanduser('~'), '.cache', 'macd')):
         """
         Initialize the strategy with parameters
         
@@ -22,6 +352,7 @@ class MACDTradingStrategy:
         - fast_period: Fast EMA period (default 12)
         - slow_period: Slow EMA period (default 26)
         - signal_period: Signal line EMA period (default 9)
+        - cache_dir: Directory for cached downloads (None disables caching)
         """
         self.symbol = symbol
         self.start_date = start_date
@@ -29,106 +360,152 @@ class MACDTradingStrategy:
         self.fast_period = fast_period
         self.slow_period = slow_period
         self.signal_period = signal_period
+        self.cache_dir = cache_dir
         self.take_profit = 0.02  # 2%
         self.stop_loss = 0.01    # 1%
         self.data = None
-        self.trades = []
+        self.trades = np.empty(0, dtype=TRADE_DTYPE)
         
+    def _cache_path(self):
+        """Location of the cached download for this symbol/date range"""
+        key = hashlib.sha1(f"{self.symbol}|{self.start_date}|{self.end_date}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+    
+    def _load_cache(self):
+        """Load a cached download, or None if caching is disabled or nothing is cached"""
+        if self.cache_dir is None or not os.path.exists(self._cache_path()):
+            return None
+        try:
+            return pd.read_parquet(self._cache_path())
+        except Exception as e:
+            print(f"Warning: Could not read price cache {self._cache_path()}. Error: {e}")
+            return None
+    
+    def _save_cache(self, df):
+        """Persist a download whose date range has fully elapsed"""
+        # A range reaching today can still gain bars, so it is always refetched
+        if self.cache_dir is None or pd.Timestamp(self.end_date) > pd.Timestamp.today().normalize():
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_parquet(self._cache_path(), compression='zstd')
+        except Exception as e:
+            print(f"Warning: Could not write price cache {self._cache_path()}. Error: {e}")
+    
     def fetch_data(self):
-        """Fetch historical price data"""
-        self.data = yf.download(self.symbol, start=self.start_date, end=self.end_date)
-        if self.data.empty:
+        """Fetch historical price data, reusing a cached download when available"""
+        cached = self._load_cache()
+        if cached is not None:
+            self.data = cached
+            return self.data
+        
+        # Only Close is used by the indicators, backtest and chart
+        self.data = _download_close([self.symbol], self.start_date, self.end_date).get(self.symbol)
+        if self.data is None or self.data.empty:
             raise ValueError(f"No data found for {self.symbol}")
+        self._save_cache(self.data)
         return self.data
     
-    def calculate_macd(self):
-        """Calculate MACD, Signal line, and Histogram"""
-        # Calculate EMAs
-        ema_fast = self.data['Close'].ewm(span=self.fast_period, adjust=False).mean()
-        ema_slow = self.data['Close'].ewm(span=self.slow_period, adjust=False).mean()
+    def calculate_macd(self, close=None):
+        """
+        Calculate MACD and Signal line
+        
+        Parameters:
+        - close: Close prices as a NumPy array (read from self.data if omitted)
+        
+        Returns the new columns as a dict of arrays; they are also added to self.data.
+        The histogram (MACD - Signal) is only needed for the chart, so
+        plot_strategy derives it when drawing.
+        """
+        if close is None:
+            close = self.data['Close'].to_numpy()
         
-        # Calculate MACD line
-        self.data['MACD'] = ema_fast - ema_slow
+        # Symbol, date range and periods identify the series; length and
+        # end points guard against a refreshed download or other input
+        ends = (close[0], close[-1]) if len(close) else ()
+        key = (self.symbol, self.start_date, self.end_date,
+               self.fast_period, self.slow_period, self.signal_period, len(close), ends)
+        columns = self._macd_cache.get(key)
+        if columns is not None:
+            self._macd_cache.move_to_end(key)
+        else:
+            # EMAs, MACD/Signal lines and bullish crossovers
+            # (MACD crosses above Signal while below zero) in one pass.
+            # float32 is ample for the indicators and halves the memory traffic;
+            # the backtest still uses float64 Close for entry/exit prices.
+            # The kernels are compiled for C-contiguous arrays only
+            kernel = _macd_kernel if NUMBA_AVAILABLE else _macd_lfilter
+            macd, signal, cross = kernel(
+                np.ascontiguousarray(close, dtype=np.float32),
+                np.float32(2.0 / (self.fast_period + 1)),
+                np.float32(2.0 / (self.slow_period + 1)),
+                np.float32(2.0 / (self.signal_period + 1))
+            )
+            columns = {
+                'MACD': macd,
+                'Signal': signal,
+                'Bullish_Cross': cross
+            }
+            # Cached arrays are shared between instances, so freeze them
+            for values in columns.values():
+                values.flags.writeable = False
+            self._macd_cache[key] = columns
+            if len(self._macd_cache) > self.MACD_CACHE_SIZE:
+                self._macd_cache.popitem(last=False)
         
-        # Calculate Signal line
-        self.data['Signal'] = self.data['MACD'].ewm(span=self.signal_period, adjust=False).mean()
+        self.data = self.data.assign(**columns)
+        return dict(columns)
         
-        # Calculate Histogram
-        self.data['Histogram'] = self.data['MACD'] - self.data['Signal']
+    def backtest(self, close=None, cross=None):
+        """
+        Run the backtest and track trades
         
-        # Identify crossovers
-        self.data['MACD_prev'] = self.data['MACD'].shift(1)
-        self.data['Signal_prev'] = self.data['Signal'].shift(1)
+        Parameters:
+        - close: float64 Close prices (read from self.data if omitted)
+        - cross: Boolean entry signals (read from self.data if omitted)
         
-        # Bullish crossover: MACD crosses above Signal while below zero
-        self.data['Bullish_Cross'] = (
-            (self.data['MACD'] > self.data['Signal']) & 
-            (self.data['MACD_prev'] <= self.data['Signal_prev']) &
-            (self.data['MACD'] < 0) &
-            (self.data['Signal'] < 0)
+        Returns the trade records, also stored in self.trades.
+        """
+        if close is None:
+            close = self.data['Close'].to_numpy()
+        if cross is None:
+            cross = self.data['Bullish_Cross'].to_numpy()
+        # No-ops for column arrays, copies for strided or mistyped input
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        cross = np.ascontiguousarray(cross, dtype=np.bool_)
+        if not NUMBA_AVAILABLE or np.count_nonzero(cross) <= SPARSE_SIGNAL_DENSITY * len(close):
+            resolver = _resolve_trades
+        else:
+            resolver = _run_backtest
+        entry_idx, exit_idx, ret, reason = resolver(
+            close, cross, self.take_profit, self.stop_loss
         )
         
-    def backtest(self):
-        """Run the backtest and track trades"""
-        position = None
-        entry_price = 0
-        entry_date = None
-        
-        for i in range(len(self.data)):
-            current_date = self.data.index[i]
-            current_price = self.data['Close'].iloc[i]
-            
-            # Check for entry signal
-            if position is None and self.data['Bullish_Cross'].iloc[i]:
-                position = 'long'
-                entry_price = float(current_price)
-                entry_date = current_date
-                
-            # Check for exit conditions
-            elif position == 'long':
-                # Calculate return
-                current_price_float = float(current_price)
-                returns = (current_price_float - entry_price) / entry_price
-                
-                # Check take profit
-                if returns >= self.take_profit:
-                    self.trades.append({
-                        'Entry Date': entry_date,
-                        'Entry Price': entry_price,
-                        'Exit Date': current_date,
-                        'Exit Price': current_price_float,
-                        'Return': returns,
-                        'Exit Reason': 'Take Profit'
-                    })
-                    position = None
-                    
-                # Check stop loss
-                elif returns <= -self.stop_loss:
-                    self.trades.append({
-                        'Entry Date': entry_date,
-                        'Entry Price': entry_price,
-                        'Exit Date': current_date,
-                        'Exit Price': current_price_float,
-                        'Return': returns,
-                        'Exit Reason': 'Stop Loss'
-                    })
-                    position = None
-        
-        # Close any open position at the end
-        if position == 'long':
-            final_price = float(self.data['Close'].iloc[-1])
-            self.trades.append({
-                'Entry Date': entry_date,
-                'Entry Price': entry_price,
-                'Exit Date': self.data.index[-1],
-                'Exit Price': final_price,
-                'Return': (final_price - entry_price) / entry_price,
-                'Exit Reason': 'End of Period'
-            })
+        trades = np.empty(len(entry_idx), dtype=TRADE_DTYPE)
+        trades['entry_idx'] = entry_idx
+        trades['exit_idx'] = exit_idx
+        trades['entry_px'] = close[entry_idx]
+        trades['exit_px'] = close[exit_idx]
+        trades['ret'] = ret
+        trades['reason'] = reason
+        self.trades = trades
+        return trades
+    
+    def trades_frame(self):
+        """Trades as a DataFrame with dates and exit reason names"""
+        dates = self.data.index
+        return pd.DataFrame({
+            'Entry Date': dates[self.trades['entry_idx']],
+            'Entry Price': self.trades['entry_px'],
+            'Exit Date': dates[self.trades['exit_idx']],
+            'Exit Price': self.trades['exit_px'],
+            'Return': self.trades['ret'],
+            'Exit Reason': np.asarray(EXIT_REASONS)[self.trades['reason']]
+        })
     
     def calculate_performance(self):
         """Calculate strategy performance metrics"""
-        if not self.trades:
+        if len(self.trades) == 0:
             return {
                 'Total Trades': 0,
                 'Winning Trades': 0,
@@ -140,22 +517,25 @@ class MACDTradingStrategy:
                 'Worst Trade': 0
             }
         
-        trades_df = pd.DataFrame(self.trades)
-        
-        winning_trades = trades_df[trades_df['Return'] > 0]
-        losing_trades = trades_df[trades_df['Return'] <= 0]
+        # Each reduction is computed once and the dict is built from scalars:
+        # the mean reuses the sum, and one bincount counts every exit reason
+        ret = self.trades['ret']
+        n = len(ret)
+        total = ret.sum()
+        winning_trades = int(np.count_nonzero(ret > 0))
+        reason_counts = np.bincount(self.trades['reason'], minlength=len(EXIT_REASONS))
         
         performance = {
-            'Total Trades': len(trades_df),
-            'Winning Trades': len(winning_trades),
-            'Losing Trades': len(losing_trades),
-            'Win Rate': len(winning_trades) / len(trades_df) * 100 if len(trades_df) > 0 else 0,
-            'Total Return': trades_df['Return'].sum() * 100,
-            'Average Return': trades_df['Return'].mean() * 100,
-            'Best Trade': trades_df['Return'].max() * 100,
-            'Worst Trade': trades_df['Return'].min() * 100,
-            'Take Profit Hits': len(trades_df[trades_df['Exit Reason'] == 'Take Profit']),
-            'Stop Loss Hits': len(trades_df[trades_df['Exit Reason'] == 'Stop Loss'])
+            'Total Trades': n,
+            'Winning Trades': winning_trades,
+            'Losing Trades': n - winning_trades,
+            'Win Rate': winning_trades / n * 100,
+            'Total Return': total * 100,
+            'Average Return': total / n * 100,
+            'Best Trade': ret.max() * 100,
+            'Worst Trade': ret.min() * 100,
+            'Take Profit Hits': int(reason_counts[0]),
+            'Stop Loss Hits': int(reason_counts[1])
         }
         
         return performance
@@ -172,11 +552,13 @@ class MACDTradingStrategy:
         ax1.scatter(entry_points.index, entry_points['Close'], 
                    color='green', marker='^', s=100, label='Buy Signal', zorder=5)
         
-        # Mark trade exits
-        for trade in self.trades:
-            color = 'lime' if trade['Return'] > 0 else 'red'
-            ax1.scatter(trade['Exit Date'], trade['Exit Price'], 
-                       color=color, marker='v', s=100, zorder=5)
+        # Mark trade exits, winners and losers as one scatter each
+        exit_dates = self.data.index[self.trades['exit_idx']]
+        win = self.trades['ret'] > 0
+        ax1.scatter(exit_dates[win], self.trades['exit_px'][win], 
+                   color='lime', marker='v', s=100, zorder=5)
+        ax1.scatter(exit_dates[~win], self.trades['exit_px'][~win], 
+                   color='red', marker='v', s=100, zorder=5)
         
         ax1.set_ylabel('Price')
         ax1.legend()
@@ -186,8 +568,10 @@ class MACDTradingStrategy:
         # Plot MACD
         ax2.plot(self.data.index, self.data['MACD'], label='MACD', color='blue')
         ax2.plot(self.data.index, self.data['Signal'], label='Signal', color='red')
-        ax2.bar(self.data.index, self.data['Histogram'], label='Histogram', 
-                color='gray', alpha=0.3)
+        # One rectangle per bar, so draw them as a bitmap instead of vector paths
+        hist = self.data['MACD'].to_numpy() - self.data['Signal'].to_numpy()
+        ax2.bar(self.data.index, hist, label='Histogram', 
+                color='gray', alpha=0.3, rasterized=True)
         ax2.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
         
         # Mark crossover points
@@ -199,26 +583,30 @@ class MACDTradingStrategy:
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(f'{self.symbol}_macd_strategy.png', dpi=300, bbox_inches='tight')
+        # Fixed margins instead of tight_layout/bbox_inches='tight', which
+        # render the figure extra times just to measure it
+        fig.subplots_adjust(left=0.07, right=0.98, top=0.95, bottom=0.07, hspace=0.08)
+        fig.savefig(f'{self.symbol}_macd_strategy.png', dpi=300)
+        plt.close(fig)
         print(f"Chart saved as {self.symbol}_macd_strategy.png")
-        # plt.show()  # Commented out for non-interactive environments
     
     def run(self):
         """Execute the complete strategy"""
         print(f"Running MACD Strategy for {self.symbol}")
         print("=" * 50)
         
-        # Fetch data
-        self.fetch_data()
+        # Fetch data (unless it was provided, e.g. by run_many)
+        if self.data is None:
+            self.fetch_data()
         print(f"Data fetched: {len(self.data)} days")
         
-        # Calculate indicators
-        self.calculate_macd()
+        # Calculate indicators, passing the same raw arrays from step to step
+        close = self.data['Close'].to_numpy(dtype=np.float64)
+        indicators = self.calculate_macd(close)
         print("MACD indicators calculated")
         
         # Run backtest
-        self.backtest()
+        self.backtest(close, indicators['Bullish_Cross'])
         print(f"Backtest complete: {len(self.trades)} trades executed")
         
         # Calculate performance
@@ -233,14 +621,119 @@ class MACDTradingStrategy:
                 print(f"{key}: {value}")
         
         # Display trade details
-        if self.trades:
+        if len(self.trades):
             print("\nTrade Details:")
             print("-" * 30)
-            trades_df = pd.DataFrame(self.trades)
+            trades_df = self.trades_frame()
             trades_df['Return'] = trades_df['Return'] * 100  # Convert to percentage
             print(trades_df.to_string())
         
         return performance, self.trades
+    
+    @classmethod
+    def invalidate_cache(cls):
+        """Drop all memoized MACD results"""
+        cls._macd_cache.clear()
+    
+    @classmethod
+    def run_many(cls, symbols, start_date, end_date, n_jobs=-1, **kwargs):
+        """
+        Run the strategy for several symbols in parallel worker processes
+        
+        Symbols share no state, so each one runs in its own process; the
+        workers reuse the on-disk Numba cache instead of recompiling.
+        Symbols that are not cached yet are downloaded up front in one
+        request. Extra keyword arguments are passed to the constructor.
+        
+        Returns a list of (symbol, (performance, trades)) tuples in input
+        order, with the exception in place of the result for symbols that
+        failed.
+        """
+        strategies = [cls(s, start_date, end_date, **kwargs) for s in symbols]
+        prefetched = cls._prefetch(strategies)
+        
+        # Workers load cached symbols themselves; failed downloads are retried
+        # there so the error is reported per symbol
+        if not JOBLIB_AVAILABLE:
+            return [_run_symbol(s, start_date, end_date, kwargs, prefetched.get(s)) for s in symbols]
+        return Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_run_symbol)(s, start_date, end_date, kwargs, prefetched.get(s)) for s in symbols
+        )
+    
+    @staticmethod
+    def _prefetch(strategies):
+        """
+        Download every strategy's symbol that is not cached yet in one request
+        
+        The downloads are written to the cache and returned keyed by symbol;
+        symbols without data are left out.
+        """
+        missing = [st.symbol for st in strategies
+                   if st.cache_dir is None or not os.path.exists(st._cache_path())]
+        if not missing:
+            return {}
+        first = strategies[0]
+        prefetched = _download_close(missing, first.start_date, first.end_date)
+        for st in strategies:
+            if st.symbol in prefetched:
+                st._save_cache(prefetched[st.symbol])
+        return prefetched
+    
+    @classmethod
+    def sweep_symbols(cls, symbols, start_date, end_date, **kwargs):
+        """
+        Backtest several symbols on their shared trading calendar in one process
+        
+        Closes are stacked into one (symbols x days) matrix over the dates on
+        which every symbol has a price, and the rows run MACD and the backtest
+        on parallel Numba threads. Symbols on different calendars (or when the
+        trade lists are needed) are better served by run_many.
+        Extra keyword arguments are passed to the constructor.
+        
+        Returns a DataFrame with one row per symbol, in input order.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        strategies = [cls(s, start_date, end_date, **kwargs) for s in symbols]
+        frames = cls._prefetch(strategies)
+        for st in strategies:
+            if st.symbol not in frames:
+                frames[st.symbol] = st._load_cache()
+        absent = [s for s in symbols if frames[s] is None or frames[s].empty]
+        if absent:
+            raise ValueError(f"No data found for {', '.join(absent)}")
+        
+        close = pd.concat([frames[s]['Close'].rename(s) for s in symbols], axis=1, join='inner')
+        close = np.ascontiguousarray(close.to_numpy(dtype=np.float64).T)
+        src = close.astype(np.float32)
+        
+        st = strategies[0]
+        a_fast = np.float32(2.0 / (st.fast_period + 1))
+        a_slow = np.float32(2.0 / (st.slow_period + 1))
+        a_sig = np.float32(2.0 / (st.signal_period + 1))
+        
+        if NUMBA_AVAILABLE:
+            total_return, win_rate, n_trades = _sweep_symbols(
+                src, close, a_fast, a_slow, a_sig, st.take_profit, st.stop_loss
+            )
+        else:
+            # Same results through the SciPy/NumPy paths, one symbol at a time
+            total_return = np.zeros(len(symbols))
+            win_rate = np.zeros(len(symbols))
+            n_trades = np.zeros(len(symbols), dtype=np.int64)
+            for i in range(len(symbols)):
+                cross = _macd_lfilter(src[i], a_fast, a_slow, a_sig)[2]
+                ret = _resolve_trades(close[i], cross, st.take_profit, st.stop_loss)[2]
+                if len(ret):
+                    total_return[i] = ret.sum() * 100
+                    win_rate[i] = np.count_nonzero(ret > 0) / len(ret) * 100
+                    n_trades[i] = len(ret)
+        
+        return pd.DataFrame({
+            'Symbol': symbols,
+            'Total Trades': n_trades,
+            'Win Rate': win_rate,
+            'Total Return': total_return
+        })
 
 
 # Example usage
@@ -259,7 +752,6 @@ if __name__ == "__main__":
     
     # Optional: Test with different symbols
     # symbols = ["AAPL", "MSFT", "GOOGL", "TSLA"]
-    # for sym in symbols:
-    #     print(f"\n{'='*60}")
-    #     strategy = MACDTradingStrategy(sym, start_date, end_date)
-    #     strategy.run()
\ No newline at end of file
+    # for sym, result in MACDTradingStrategy.run_many(symbols, start_date, end_date):
+    #     if isinstance(result, Exception):
+    #         print(f"{sym}: failed ({result})")
\ No newline at end of file
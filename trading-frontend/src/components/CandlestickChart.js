@@ -10,10 +10,10 @@ function CandlestickChart({ data, indicators, trades, symbol, interval }) {
     // Candlestick trace
     traces.push({
       x: data.timestamps,
-      open: data.ohlcv.map(d => d.Open),
-      high: data.ohlcv.map(d => d.High),
-      low: data.ohlcv.map(d => d.Low),
-      close: data.ohlcv.map(d => d.Close),
+      open: data.ohlcv.Open,
+      high: data.ohlcv.High,
+      low: data.ohlcv.Low,
+      close: data.ohlcv.Close,
       type: 'candlestick',
       name: 'Price',
       increasing: { line: { color: '#00ff88' } },
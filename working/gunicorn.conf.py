@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for the interactive dashboard (see wsgi.py)
+"""
+
+import os
+
+bind = os.environ.get('DASHBOARD_BIND', '0.0.0.0:5000')
+
+# Backtests are CPU-bound, so processes are what lets independent sessions run
+# side by side; the threads keep a worker answering while one request waits on
+# Binance. The dashboard's Socket.IO client only uses the WebSocket transport,
+# so its connections never need sticky sessions across workers.
+workers = int(os.environ.get('DASHBOARD_WORKERS', os.cpu_count() or 1))
+worker_class = 'gthread'
+# Every open dashboard tab keeps a WebSocket on one of these threads for as
+# long as it stays open, so size them for the expected tabs per worker plus
+# headroom for plain HTTP requests
+threads = int(os.environ.get('DASHBOARD_THREADS', 100))
+
+# Each worker also starts its own backtest process pool; split the CPUs between
+# them instead of giving every worker one process per CPU. The workers inherit
+# this environment, so DASHBOARD_PROCESSES set explicitly still wins
+os.environ.setdefault('DASHBOARD_PROCESSES', str(max(1, (os.cpu_count() or 1) // workers)))
+
+# Import pandas/numpy/plotly once in the master instead of once per worker
+preload_app = True
+
+# A cold run fetches days of klines before the first byte is sent
+timeout = 120
@@ -5,13 +5,207 @@ This Flask server provides real-time updates for the MACD strategy dashboard.
 Run this server and access http://localhost:5000 for the full interactive experience.
 """
 
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
+from flask_socketio import SocketIO
+import copy
+import hashlib
 import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from cachetools import TLRUCache
+import numpy as np
+import orjson
 from interactive_macd_strategy import InteractiveCryptoMACDStrategy
 
+# Optional response compression (the trace JSON is mostly repeated timestamp
+# prefixes and digits)
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    Compress = None
+    COMPRESS_AVAILABLE = False
+
+# Optional binary responses (floats as 9 bytes instead of ~18 characters of JSON)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+# Optional one-pass decoding and validation of the strategy parameters
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    msgspec = None
+    MSGSPEC_AVAILABLE = False
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
+socketio = SocketIO(app, cors_allowed_origins="*")
+
+if COMPRESS_AVAILABLE:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json', 'application/x-ndjson']
+    Compress(app)
+
+# Strategy parameters as (name, type, default); REQUIRED has no default
+REQUIRED = object()
+PARAM_FIELDS = [
+    ('symbol', str, REQUIRED),
+    ('interval', str, REQUIRED),
+    ('days_back', int, 30),
+    ('fast_length', int, 12),
+    ('slow_length', int, 26),
+    ('signal_smoothing', int, 9),
+    ('take_profit', float, 0.02),
+    ('stop_loss', float, 0.01)
+]
+PARAM_NAMES = tuple(name for name, _, _ in PARAM_FIELDS)
+
+if MSGSPEC_AVAILABLE:
+    StrategyParams = msgspec.defstruct(
+        'StrategyParams',
+        [(name, kind) if default is REQUIRED else (name, kind, default) for name, kind, default in PARAM_FIELDS]
+    )
+
+# Parameters that change the candles or the MACD; take profit / stop loss only
+# affect the backtest
+DATA_PARAMS = ('symbol', 'interval', 'days_back', 'fast_length', 'slow_length', 'signal_smoothing')
+
+def parse_params(data):
+    """
+    Validated strategy parameters from a JSON request body (bytes) or an
+    already decoded dict; numeric strings are coerced and missing optional
+    parameters take their defaults. Raises ValueError on bad input.
+    """
+    if MSGSPEC_AVAILABLE:
+        # Decoding, validation and coercion in one pass
+        if isinstance(data, (bytes, bytearray)):
+            params = msgspec.json.decode(data, type=StrategyParams, strict=False)
+        else:
+            params = msgspec.convert(data, StrategyParams, strict=False)
+        return msgspec.structs.asdict(params)
+
+    if isinstance(data, (bytes, bytearray)):
+        data = orjson.loads(data)
+    if not isinstance(data, dict):
+        raise ValueError('Parameters must be a JSON object')
+    params = {}
+    for name, kind, default in PARAM_FIELDS:
+        if name not in data:
+            if default is REQUIRED:
+                raise ValueError(f'Missing parameter: {name}')
+            params[name] = default
+            continue
+        try:
+            params[name] = kind(data[name])
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid {name}: {data[name]!r}')
+    return params
+
+def pack_response(response_data):
+    """MessagePack encoding of a response; numpy scalars (performance figures) go in as Python numbers"""
+    def default(obj):
+        if isinstance(obj, np.generic):
+            return obj.item()
+        raise TypeError(f"Cannot serialize {type(obj).__name__}")
+    return msgpack.packb(response_data, use_bin_type=True, default=default)
+
+def _cache_expiry(key, value, now):
+    """Cached runs live for half a bar (at least 10s), so new candles still show up"""
+    units = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    try:
+        ttl = max(10, int(key[1][:-1]) * units[key[1][-1]] // 2)
+    except (KeyError, ValueError):
+        ttl = 10
+    return now + ttl
+
+# Fetched candles + MACD by data parameter values: {'strategy', 'candlestick'},
+# where 'candlestick' is the converted candle trace once a response used it
+DATA_CACHE = TLRUCache(maxsize=32, ttu=_cache_expiry)
+# Complete responses by all parameter values
+RESULT_CACHE = TLRUCache(maxsize=128, ttu=_cache_expiry)
+_cache_lock = threading.Lock()
+
+# Backtests run in worker processes so they use every core instead of taking
+# turns on the GIL. Created on first use: a pool started before gunicorn forks
+# its workers would not survive the fork
+_executor = None
+_executor_lock = threading.Lock()
+
+# Jobs of /api/jobs, one file per id in a directory every gunicorn worker sees,
+# so a poll may land on any worker. A job runs strategy_response() on a thread,
+# which hands the CPU part to the process pool. Files are removed JOB_TTL
+# seconds after their last write
+JOB_DIR = os.environ.get('DASHBOARD_JOB_DIR', os.path.join(tempfile.gettempdir(), 'macdbot-jobs'))
+JOB_TTL = 600
+_job_threads = ThreadPoolExecutor(max_workers=8)
+
+def get_executor():
+    """
+    The process pool for backtests (DASHBOARD_PROCESSES workers, default one per
+    CPU; gunicorn.conf.py divides the CPUs between its workers instead)
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.environ.get('DASHBOARD_PROCESSES', os.cpu_count() or 1))
+            # spawn: forking a threaded server can copy locks held by other threads
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+def _job_path(job_id):
+    """State file of a job, or None for an id /api/jobs could not have issued"""
+    try:
+        if uuid.UUID(job_id).hex != job_id:
+            return None
+    except ValueError:
+        return None
+    return os.path.join(JOB_DIR, f"{job_id}.json")
+
+
+def _write_job(job_id, state):
+    """Store a job's state; written to a temporary file first so pollers never see a partial file"""
+    path = _job_path(job_id)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(state, option=orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp_path, path)
+
+
+def _prune_jobs():
+    """Remove job files older than JOB_TTL"""
+    cutoff = time.time() - JOB_TTL
+    for item in os.scandir(JOB_DIR):
+        try:
+            if item.stat().st_mtime < cutoff:
+                os.remove(item.path)
+        except OSError:
+            # Already removed by another worker
+            pass
+
+
+def run_job(job_id, params):
+    """Run a job from /api/jobs and store its result or error"""
+    try:
+        state = {'status': 'done', 'result': strategy_response(params)}
+    except Exception as e:
+        print(f"ERROR: Exception in job {job_id}: {str(e)}")
+        traceback.print_exc()
+        state = {'status': 'error', 'error': str(e)}
+    _write_job(job_id, state)
+
 
 def create_enhanced_dashboard_template():
     """Create the enhanced dashboard template with real API integration"""
@@ -21,6 +215,8 @@ def create_enhanced_dashboard_template():
 <head>
     <title>Interactive MACD Strategy Dashboard</title>
     <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="https://cdn.socket.io/4.7.5/socket.io.min.js"></script>
+    <script src="https://unpkg.com/@msgpack/msgpack@2.8.0/dist.es5+umd/msgpack.min.js"></script>
     <style>
         body {
             background-color: #131722;
@@ -222,6 +418,12 @@ def create_enhanced_dashboard_template():
     </div>
 
     <script>
+        // Persistent channel for strategy updates; plain HTTP is the fallback
+        // while it is not connected. WebSocket only (no long-polling), so the
+        // connection works across several gunicorn workers without sticky sessions
+        const socket = io({transports: ['websocket']});
+        socket.on('tick', applyTick);
+        
         // Load initial data
         window.onload = function() {
             updateStrategy();
@@ -245,16 +447,102 @@ def create_enhanced_dashboard_template():
                 return;
             }
             
-            // Convert string dates back to Date objects for Plotly
-            data.traces.forEach(trace => {
-                if (trace.x && trace.x.length > 0) {
-                    trace.x = trace.x.map(dateStr => new Date(dateStr));
-                }
+            // x values are epoch milliseconds, which the date axis takes as they are
+            // react diffs against the current chart instead of rebuilding it
+            Plotly.react('chart', data.traces, chartLayout(data.title), {responsive: true});
+        }
+        
+        // Reads the NDJSON response of /api/update_strategy, drawing each trace
+        // as soon as its line arrives; resolves to the final record
+        async function streamStrategy(params) {
+            const response = await fetch('/api/update_strategy', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/x-ndjson'
+                },
+                body: JSON.stringify(params)
             });
             
-            const layout = {
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffered = '';
+            let layout = null;
+            let drawn = 0;
+            while (true) {
+                const {done, value} = await reader.read();
+                buffered += decoder.decode(value || new Uint8Array(), {stream: !done});
+                const lines = buffered.split('\\n');
+                buffered = done ? '' : lines.pop();
+                for (const line of lines) {
+                    if (!line) continue;
+                    const record = JSON.parse(line);
+                    if ('title' in record) {
+                        layout = chartLayout(record.title);
+                    } else if ('trace' in record) {
+                        const trace = record.trace;
+                        if (drawn++ === 0) {
+                            Plotly.react('chart', [trace], layout, {responsive: true});
+                        } else {
+                            Plotly.addTraces('chart', trace);
+                        }
+                    } else {
+                        return record;
+                    }
+                }
+                if (done) {
+                    throw new Error('Response ended before the performance summary');
+                }
+            }
+        }
+        
+        // Applies a 'tick' (the newest bar and its indicators) to the chart:
+        // a new bar is appended to the candle and indicator traces, an update
+        // of the current bar overwrites their last point. Signal markers stay
+        // as they are until the next full update
+        function applyTick(p) {
+            const gd = document.getElementById('chart');
+            if (!gd.data) {
+                return;
+            }
+            const values = {
+                'Price': {open: p.open, high: p.high, low: p.low, close: p.close},
+                '200 EMA': {y: p.ema_200},
+                'MACD': {y: p.macd},
+                'Signal': {y: p.signal},
+                'Histogram': {y: p.histogram}
+            };
+            for (const trace of gd.data) {
+                const update = values[trace.name];
+                if (!update || !trace.x.length) {
+                    continue;
+                }
+                const last = trace.x.length - 1;
+                if (!p.new_bar && trace.x[last] !== p.x) {
+                    continue;
+                }
+                if (p.new_bar) {
+                    trace.x.push(p.x);
+                }
+                const i = p.new_bar ? last + 1 : last;
+                for (const [key, value] of Object.entries(update)) {
+                    trace[key][i] = value;
+                }
+                if (trace.name === 'Histogram') {
+                    trace.marker.color[i] = p.histogram >= 0 ? '#00ff88' : '#ff4976';
+                }
+            }
+            Plotly.redraw(gd);
+        }
+        
+        function chartLayout(title) {
+            return {
                 title: {
-                    text: data.title,
+                    text: title,
                     x: 0.5,
                     font: {size: 16, color: 'white'}
                 },
@@ -304,8 +592,6 @@ def create_enhanced_dashboard_template():
                 },
                 grid: {rows: 2, columns: 1, pattern: 'independent', roworder: 'top to bottom'}
             };
-            
-            Plotly.newPlot('chart', data.traces, layout, {responsive: true});
         }
         
         function updateStats(performance) {
@@ -338,22 +624,26 @@ def create_enhanced_dashboard_template():
             };
             
             try {
-                const response = await fetch('/api/update_strategy', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify(params)
-                });
-                
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}`);
+                let result;
+                if (socket.connected) {
+                    // Reuses the open connection instead of a request per update.
+                    // Asks for MessagePack when the decoder loaded; the server
+                    // answers with JSON anyway if it has no msgpack
+                    result = await socket.timeout(120000).emitWithAck('update_strategy', {...params, binary: 'MessagePack' in window});
+                    if (result instanceof ArrayBuffer) {
+                        result = MessagePack.decode(new Uint8Array(result));
+                    }
+                    if (result.success) {
+                        displayChart(result.chart_data);
+                        // Keep the newest bar live on the chart just drawn
+                        socket.emit('subscribe_ticks', params);
+                    }
+                } else {
+                    // Draws the chart trace by trace while the response streams in
+                    result = await streamStrategy(params);
                 }
                 
-                const result = await response.json();
-                
                 if (result.success) {
-                    displayChart(result.chart_data);
                     updateStats(result.performance);
                     showMessage(`✅ Strategy updated successfully! Found ${result.performance.totalTrades} trades.`, 'success');
                 } else {
@@ -385,25 +675,34 @@ def create_enhanced_dashboard_template():
 </html>
 """
 
+# The template has no per-request variables, so it is rendered once
+DASHBOARD_HTML = app.jinja_env.from_string(create_enhanced_dashboard_template()).render().encode('utf-8')
+DASHBOARD_ETAG = hashlib.sha1(DASHBOARD_HTML).hexdigest()
+
 @app.route('/')
 def dashboard():
-    """Serve the main dashboard"""
-    return render_template_string(create_enhanced_dashboard_template())
+    """Serve the main dashboard; browsers revalidate with If-None-Match and get a 304 while it is unchanged"""
+    response = Response(DASHBOARD_HTML, mimetype='text/html')
+    response.set_etag(DASHBOARD_ETAG)
+    # Revalidate on every load so a restarted server's new page (and API
+    # format) is picked up immediately; unchanged pages cost only the 304
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response.make_conditional(request)
 
-@app.route('/api/update_strategy', methods=['POST'])
-def update_strategy():
-    """API endpoint to update strategy with new parameters"""
-    try:
-        print("=== DEBUG: API endpoint called ===")
-        params = request.json
-        print(f"DEBUG: Received params: {params}")
-        
-        # Validate parameters
-        required_params = ['symbol', 'interval', 'days_back', 'fast_length', 'slow_length', 'signal_smoothing', 'take_profit', 'stop_loss']
-        for param in required_params:
-            if param not in params:
-                return jsonify({'success': False, 'error': f'Missing parameter: {param}'}), 400
-        
+def run_strategy(params, backtest=True):
+    """
+    Run the strategy for the given parameters
+
+    Candles and MACD are taken from DATA_CACHE when another run already
+    fetched them, so take profit / stop loss changes only repeat the backtest.
+    With backtest=False the strategy is returned ready for backtest().
+    Returns (strategy, cache entry).
+    """
+    key = tuple(params[name] for name in DATA_PARAMS)
+    with _cache_lock:
+        entry = DATA_CACHE.get(key)
+
+    if entry is None:
         # Create strategy with new parameters
         print("DEBUG: Creating strategy instance...")
         strategy = InteractiveCryptoMACDStrategy(
@@ -415,136 +714,307 @@ def update_strategy():
             signal_smoothing=params['signal_smoothing']
         )
         print("DEBUG: Strategy instance created successfully")
-        
-        # Update take profit and stop loss
-        strategy.take_profit = params['take_profit']
-        strategy.stop_loss = params['stop_loss']
-        
+
         # Run the strategy
         print("DEBUG: Fetching data...")
         strategy.fetch_data()
         print("DEBUG: Calculating MACD...")
         strategy.calculate_macd()
+
+        entry = {'strategy': strategy, 'candlestick': None}
+        with _cache_lock:
+            DATA_CACHE[key] = entry
+
+    # Work on a copy so concurrent requests never share the frame or trades
+    # (and the Binance client is not constructed again)
+    strategy = copy.copy(entry['strategy'])
+    strategy.data = entry['strategy'].data.copy()
+    strategy.trades = []
+
+    # Update take profit and stop loss
+    strategy.take_profit = params['take_profit']
+    strategy.stop_loss = params['stop_loss']
+
+    if backtest:
         print("DEBUG: Running backtest...")
         strategy.backtest()
-        
-        # Get performance metrics
-        print("DEBUG: Calculating performance...")
-        performance = strategy.calculate_performance()
-        
-        # Get chart data
-        print("DEBUG: Creating chart...")
-        fig = strategy.create_interactive_plot()
-        print("DEBUG: Chart created successfully")
-        
-        # Convert chart data to JSON format using the same method as interactive_macd_strategy.py
-        print("DEBUG: Converting chart data to JSON...")
-        chart_data = {
-            "title": f"{params['symbol']} - MACD + 200 EMA Strategy ({params['interval']})",
-            "traces": []
+
+    return strategy, entry
+
+
+def response_records(strategy, params, entry=None):
+    """
+    Response of a strategy run as a sequence of records: the chart title, one
+    record per trace, then the performance summary
+
+    The candlestick trace does not depend on take profit / stop loss, so it is
+    built once per cache entry.
+    """
+    yield {"title": f"{params['symbol']} - MACD + 200 EMA Strategy ({params['interval']})"}
+
+    # Plain trace dicts straight from the strategy's DataFrame; no Plotly figure
+    candlestick = entry['candlestick'] if entry is not None else None
+    for trace_dict in strategy.iter_trace_dicts(candlestick=candlestick):
+        if trace_dict['type'] == 'candlestick' and entry is not None:
+            entry['candlestick'] = trace_dict
+        yield {"trace": trace_dict}
+
+    # Get performance metrics
+    print("DEBUG: Calculating performance...")
+    performance = strategy.calculate_performance()
+    yield {
+        'success': True,
+        'performance': {
+            'totalTrades': performance.get('Total Trades', 0),
+            'winRate': performance.get('Win Rate', 0),
+            'totalReturn': performance.get('Total Return', 0),
+            'avgReturn': performance.get('Average Return', 0),
+            'bestTrade': performance.get('Best Trade', 0),
+            'worstTrade': performance.get('Worst Trade', 0)
         }
+    }
+
+
+def add_record(response_data, record):
+    """Merge one record of response_records() into a response dict"""
+    if 'trace' in record:
+        response_data['chart_data']['traces'].append(record['trace'])
+    elif 'title' in record:
+        response_data['chart_data']['title'] = record['title']
+    else:
+        response_data.update(record)
+
+
+def split_response(response_data):
+    """The records of a complete response dict, in response_records() order"""
+    yield {'title': response_data['chart_data']['title']}
+    for trace_dict in response_data['chart_data']['traces']:
+        yield {'trace': trace_dict}
+    yield {'success': True, 'performance': response_data['performance']}
+
+
+def build_response(strategy, params, entry=None):
+    """Performance summary and chart traces of a strategy run, as sent to the dashboard"""
+    response_data = {'success': True, 'chart_data': {'title': None, 'traces': []}}
+    for record in response_records(strategy, params, entry):
+        add_record(response_data, record)
+    return response_data
+
+
+def backtest_response(strategy, params, candlestick=None):
+    """Backtest a prepared strategy and build its response; runs in the process pool"""
+    strategy.backtest()
+    return build_response(strategy, params, {'candlestick': candlestick})
+
+
+def strategy_response(params):
+    """
+    Response for a validated parameter set, from RESULT_CACHE when the same run
+    was already requested
+
+    Fetching stays on the calling thread; the backtest and trace building run
+    in the process pool, so the thread only waits without holding the GIL.
+    """
+    key = tuple(params[name] for name in PARAM_NAMES)
+    with _cache_lock:
+        response_data = RESULT_CACHE.get(key)
+    if response_data is None:
+        strategy, entry = run_strategy(params, backtest=False)
+        # The Binance client is not needed for the backtest and need not pickle
+        strategy.client = None
+        future = get_executor().submit(backtest_response, strategy, params, entry['candlestick'])
+        response_data = future.result()
+        if entry['candlestick'] is None:
+            entry['candlestick'] = response_data['chart_data']['traces'][0]
+        with _cache_lock:
+            RESULT_CACHE[key] = response_data
+    return response_data
+
+
+def encode_response(response_data):
+    """Response data as MessagePack or JSON, whichever the request accepts"""
+    if MSGPACK_AVAILABLE and request.accept_mimetypes.best_match(['application/json', 'application/msgpack']) == 'application/msgpack':
+        return Response(pack_response(response_data), mimetype='application/msgpack')
+    # orjson writes NaN as null, which the browser's JSON.parse accepts
+    return app.response_class(orjson.dumps(response_data, option=orjson.OPT_SERIALIZE_NUMPY), mimetype='application/json')
+
+
+def stream_response(params):
+    """
+    NDJSON body for a validated parameter set: one line per response record
+
+    The run goes through strategy_response(), so the backtest and trace
+    building happen in the process pool and complete runs land in
+    RESULT_CACHE. A failure is reported as a final error record.
+    """
+    try:
+        response_data = strategy_response(params)
+        for record in split_response(response_data):
+            yield orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY) + b'\n'
+
+    except Exception as e:
+        print(f"ERROR: Exception while streaming update_strategy: {str(e)}")
+        traceback.print_exc()
+        yield orjson.dumps({'success': False, 'error': str(e)}) + b'\n'
+
+
+@app.route('/api/update_strategy', methods=['POST'])
+def update_strategy():
+    """API endpoint to update strategy with new parameters"""
+    try:
+        print("=== DEBUG: API endpoint called ===")
+        try:
+            params = parse_params(request.get_data())
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        print(f"DEBUG: Received params: {params}")
         
-        print(f"DEBUG: Processing {len(fig.data)} traces...")
-        for trace in fig.data:
-            # Handle candlestick trace separately
-            if trace.type == 'candlestick':
-                trace_dict = {
-                    "x": [
-                        (x.isoformat() if hasattr(x, 'isoformat') else str(x))
-                        for x in trace.x
-                    ],  # ISO timestamps for reliable timezone parsing
-                    "open": list(trace.open),
-                    "high": list(trace.high),
-                    "low": list(trace.low),
-                    "close": list(trace.close),
-                    "type": trace.type,
-                    "name": trace.name,
-                    "yaxis": getattr(trace, 'yaxis', 'y'),
-                    "xaxis": getattr(trace, 'xaxis', 'x')
-                }
-            else:
-                # Handle other trace types (scatter, bar, etc.)
-                trace_dict = {
-                    "x": [
-                        (x.isoformat() if hasattr(x, 'isoformat') else str(x))
-                        for x in trace.x
-                    ] if hasattr(trace, 'x') else [],
-                    "y": list(trace.y) if hasattr(trace, 'y') else [],
-                    "type": trace.type,
-                    "name": trace.name,
-                    "yaxis": getattr(trace, 'yaxis', 'y'),
-                    "xaxis": getattr(trace, 'xaxis', 'x')
-                }
-                
-                # Add optional attributes if they exist
-                if hasattr(trace, 'mode'):
-                    trace_dict["mode"] = trace.mode
-                    
-                # Handle line attributes safely
-                if hasattr(trace, 'line') and trace.line:
-                    try:
-                        line_dict = {}
-                        if hasattr(trace.line, 'color'):
-                            line_dict['color'] = trace.line.color
-                        if hasattr(trace.line, 'width'):
-                            line_dict['width'] = trace.line.width
-                        if line_dict:
-                            trace_dict["line"] = line_dict
-                    except:
-                        pass
-                        
-                # Handle marker attributes safely  
-                if hasattr(trace, 'marker') and trace.marker:
-                    try:
-                        marker_dict = {}
-                        if hasattr(trace.marker, 'color'):
-                            marker_dict['color'] = trace.marker.color
-                        if hasattr(trace.marker, 'size'):
-                            marker_dict['size'] = trace.marker.size
-                        if hasattr(trace.marker, 'symbol'):
-                            marker_dict['symbol'] = trace.marker.symbol
-                        if marker_dict:
-                            trace_dict["marker"] = marker_dict
-                    except:
-                        pass
-                        
-                # Handle bar chart marker_color
-                if hasattr(trace, 'marker_color'):
-                    try:
-                        if hasattr(trace.marker_color, '__iter__') and not isinstance(trace.marker_color, str):
-                            trace_dict["marker_color"] = list(trace.marker_color)
-                        else:
-                            trace_dict["marker_color"] = trace.marker_color
-                    except:
-                        pass
-            
-            chart_data["traces"].append(trace_dict)
-            print(f"DEBUG: Trace processed successfully: {trace.type} - {trace.name}")
-        
-        print("DEBUG: Chart data conversion complete")
+        offered = ['application/json', 'application/x-ndjson'] + (['application/msgpack'] if MSGPACK_AVAILABLE else [])
+        if request.accept_mimetypes.best_match(offered) == 'application/x-ndjson':
+            return Response(stream_response(params), mimetype='application/x-ndjson')
         
-        print("DEBUG: Preparing response...")
-        response_data = {
-            'success': True,
-            'chart_data': chart_data,
-            'performance': {
-                'totalTrades': performance.get('Total Trades', 0),
-                'winRate': performance.get('Win Rate', 0),
-                'totalReturn': performance.get('Total Return', 0),
-                'avgReturn': performance.get('Average Return', 0),
-                'bestTrade': performance.get('Best Trade', 0),
-                'worstTrade': performance.get('Worst Trade', 0)
-            }
-        }
-        print("DEBUG: Response prepared successfully")
-        return jsonify(response_data)
+        return encode_response(strategy_response(params))
         
     except Exception as e:
         print(f"ERROR: Exception in update_strategy: {str(e)}")
-        import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Start a strategy run in the background; returns its job id right away (202)"""
+    try:
+        params = parse_params(request.get_data())
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    job_id = uuid.uuid4().hex
+    try:
+        os.makedirs(JOB_DIR, exist_ok=True)
+        _prune_jobs()
+        _write_job(job_id, {'status': 'running'})
+    except OSError as e:
+        return jsonify({'success': False, 'error': f'Could not store job: {e}'}), 500
+    _job_threads.submit(run_job, job_id, params)
+    return jsonify({'success': True, 'job_id': job_id}), 202
+
+
+@app.route('/api/job/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Result of a job from /api/jobs: 202 while it runs, then the same response as /api/update_strategy"""
+    path = _job_path(job_id)
+    state = None
+    if path is not None:
+        try:
+            with open(path, 'rb') as f:
+                state = orjson.loads(f.read())
+        except OSError:
+            pass
+    if state is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    
+    if state['status'] == 'running':
+        return jsonify({'success': True, 'status': 'running'}), 202
+    if state['status'] == 'error':
+        return jsonify({'success': False, 'error': state['error']}), 500
+    return encode_response(state['result'])
+
+
+@socketio.on('update_strategy')
+def on_update_strategy(data):
+    """
+    WebSocket counterpart of /api/update_strategy; the return value is the
+    client's acknowledgement
+
+    With a truthy 'binary' parameter (and msgpack installed) the response is
+    acknowledged as MessagePack bytes, which Socket.IO sends as a binary frame.
+    """
+    try:
+        try:
+            params = parse_params(data)
+        except ValueError as e:
+            return {'success': False, 'error': str(e)}
+        
+        response_data = strategy_response(params)
+        if isinstance(data, dict) and data.get('binary') and MSGPACK_AVAILABLE:
+            return pack_response(response_data)
+        return response_data
+        
+    except Exception as e:
+        print(f"ERROR: Exception in WebSocket update_strategy: {str(e)}")
+        traceback.print_exc()
+        return {'success': False, 'error': str(e)}
+
+
+
+# Live chart updates: one strategy per subscribed connection, kept across ticks
+# so each poll only recomputes the newest bar. Stop events by Socket.IO sid
+TICK_SECONDS = 2
+_live = {}
+_live_lock = threading.Lock()
+
+def stop_ticks(sid):
+    """Stop the tick loop of a connection, if it has one"""
+    with _live_lock:
+        stop = _live.pop(sid, None)
+    if stop is not None:
+        stop.set()
+
+
+def tick_loop(sid, strategy, stop):
+    """Poll the latest klines into the strategy and emit each changed bar to the client"""
+    last_point = None
+    while not stop.wait(TICK_SECONDS):
+        try:
+            klines = strategy.client.get_klines(symbol=strategy.symbol, interval=strategy.interval, limit=2)
+        except Exception as e:
+            print(f"ERROR: Fetching live klines for {strategy.symbol}: {e}")
+            continue
+        for kline in klines:
+            point = strategy.update_macd_incremental(kline)
+            if point is not None and point != last_point:
+                socketio.emit('tick', point, to=sid)
+                last_point = point
+
+
+@socketio.on('subscribe_ticks')
+def on_subscribe_ticks(data):
+    """
+    Start sending 'tick' events with the newest bar for the given parameters,
+    replacing the connection's previous subscription
+    """
+    try:
+        params = parse_params(data)
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+    
+    sid = request.sid
+    stop_ticks(sid)
+    try:
+        strategy, _ = run_strategy(params, backtest=False)
+    except Exception as e:
+        print(f"ERROR: Exception in WebSocket subscribe_ticks: {str(e)}")
+        traceback.print_exc()
+        return {'success': False, 'error': str(e)}
+    
+    stop = threading.Event()
+    with _live_lock:
+        _live[sid] = stop
+    socketio.start_background_task(tick_loop, sid, strategy, stop)
+    return {'success': True}
+
+
+@socketio.on('unsubscribe_ticks')
+def on_unsubscribe_ticks():
+    stop_ticks(request.sid)
+    return {'success': True}
+
+
+@socketio.on('disconnect')
+def on_disconnect(*args):
+    stop_ticks(request.sid)
+
 if __name__ == '__main__':
     print("🚀 Starting Interactive MACD Strategy Dashboard Server...")
     print("📊 Access the dashboard at: http://localhost:5000")
@@ -554,6 +1024,7 @@ if __name__ == '__main__':
     print("   • Interactive TradingView-style charts")
     print("   • Live performance metrics")
     print("   • Risk management controls")
-    print("\n🛑 Press Ctrl+C to stop the server")
+    print("\n🧪 Development server; for production run: gunicorn -c gunicorn.conf.py wsgi:app")
+    print("🛑 Press Ctrl+C to stop the server")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    socketio.run(app, debug=True, host='0.0.0.0', port=5000)
@@ -1,12 +1,38 @@
+import os
+import threading
 import pandas as pd
 import numpy as np
 from binance.client import Client
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
 import pytz
 
+
+# Klines of every symbol/interval fetched so far, extended incrementally
+KLINE_CACHE_DIR = os.path.expanduser('~/.cache/macdbot')
+
+# Recent kline loads by (symbol, interval, start date), so strategies that only
+# differ in their MACD settings share one fetch
+_kline_memory = TTLCache(maxsize=16, ttl=60)
+_kline_memory_lock = threading.Lock()
+
+
+def _epoch_ms(x):
+    """
+    Timestamps as milliseconds since the epoch of their wall-clock time
+
+    Plotly reads numbers on a date axis as wall-clock time, so the chart shows
+    the data's own timezone whatever the browser's timezone is.
+    """
+    index = pd.DatetimeIndex(x)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ms').asi8.tolist()
+
+
 class InteractiveCryptoMACDStrategy:
     """
     Interactive MACD Crossover Trading Strategy for Cryptocurrency
@@ -16,12 +42,13 @@ class InteractiveCryptoMACDStrategy:
     - Interactive TradingView-style plots with 200 EMA trend filter
     """
     
-    def __init__(self, symbol, days_back=30, interval='5m', fast_length=12, slow_length=26, signal_smoothing=9, source='close', oscillator_ma_type='EMA', signal_line_ma_type='EMA', timezone='UTC'):
+    def __init__(self, symbol, days_back=30, interval='5m', fast_length=12, slow_length=26, signal_smoothing=9, source='close', oscillator_ma_type='EMA', signal_line_ma_type='EMA', timezone='UTC', cache_dir=KLINE_CACHE_DIR):
         """
         Initialize the strategy with TradingView MACD settings
         
         Parameters:
         - timezone: Target timezone for displaying timestamps (e.g., 'UTC', 'US/Eastern', 'Europe/London', 'Asia/Shanghai', 'Asia/Tokyo')
+        - cache_dir: Directory of the on-disk kline cache (None to always fetch everything)
         """
         self.symbol = symbol
         self.days_back = days_back
@@ -33,6 +60,7 @@ class InteractiveCryptoMACDStrategy:
         self.oscillator_ma_type = oscillator_ma_type.upper()
         self.signal_line_ma_type = signal_line_ma_type.upper()
         self.timezone = timezone
+        self.cache_dir = cache_dir
         
         # For backward compatibility
         self.fast_period = fast_length
@@ -43,58 +71,118 @@ class InteractiveCryptoMACDStrategy:
         self.stop_loss = 0.01    # 1%
         self.data = None
         self.trades = []
+        # EMA (fast, slow, signal, 200) of the last and second to last bar
+        self._ema_state = None
+        self._ema_prev_state = None
         
         # Initialize Binance client
         self.client = Client()
         
+    def _cache_path(self):
+        """Location of the cached klines for this symbol/interval"""
+        return os.path.join(self.cache_dir, f"{self.symbol}_{self.interval}.parquet")
+    
+    def _load_cache(self):
+        """Load the cached klines, or None if caching is disabled or nothing is cached"""
+        if self.cache_dir is None or not os.path.exists(self._cache_path()):
+            return None
+        try:
+            return pd.read_parquet(self._cache_path())
+        except Exception as e:
+            print(f"Warning: Could not read kline cache {self._cache_path()}. Error: {e}")
+            return None
+    
+    def _save_cache(self, df):
+        """Persist the klines; written to a temporary file first so readers never see a partial file"""
+        if self.cache_dir is None:
+            return
+        tmp_path = f"{self._cache_path()}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_parquet(tmp_path, compression='zstd')
+            os.replace(tmp_path, self._cache_path())
+        except Exception as e:
+            print(f"Warning: Could not write kline cache {self._cache_path()}. Error: {e}")
+    
+    def _download_klines(self, start):
+        """OHLCV klines from start (UTC date string or epoch ms) until now, indexed by open time in UTC"""
+        klines = self.client.get_historical_klines(
+            self.symbol, 
+            self.interval, 
+            start
+        )
+        
+        df = pd.DataFrame(klines, columns=[
+            'timestamp', 'open', 'high', 'low', 'close', 'volume',
+            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
+            'taker_buy_quote', 'ignore'
+        ])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        
+        price_cols = ['open', 'high', 'low', 'close', 'volume']
+        for col in price_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        df.rename(columns={
+            'open': 'Open',
+            'high': 'High', 
+            'low': 'Low',
+            'close': 'Close',
+            'volume': 'Volume'
+        }, inplace=True)
+        return df[['Open', 'High', 'Low', 'Close', 'Volume']]
+    
+    def _load_klines(self, start_str):
+        """
+        Klines since start_str, through the in-memory and on-disk caches
+        
+        A cache file that reaches back to start_str is only extended: klines are
+        fetched from its last bar on (which may still have been open when saved).
+        """
+        key = (self.symbol, self.interval, start_str)
+        with _kline_memory_lock:
+            df = _kline_memory.get(key)
+        if df is not None:
+            return df
+        
+        start = pd.Timestamp(start_str)
+        cached = self._load_cache()
+        if cached is not None and not cached.empty and cached.index[0] <= start:
+            newer = self._download_klines(int(cached.index.as_unit('ms').asi8[-1]))
+            df = pd.concat([cached[cached.index < newer.index[0]], newer]) if not newer.empty else cached
+        else:
+            df = self._download_klines(start_str)
+        if not df.empty:
+            self._save_cache(df)
+        
+        df = df[df.index >= start]
+        with _kline_memory_lock:
+            _kline_memory[key] = df
+        return df
+    
     def fetch_data(self):
-        """Fetch historical price data from Binance"""
+        """Fetch historical price data from Binance, reusing cached klines where possible"""
         try:
             start_time = datetime.now() - timedelta(days=self.days_back)
             start_str = start_time.strftime('%Y-%m-%d')
             
-            klines = self.client.get_historical_klines(
-                self.symbol, 
-                self.interval, 
-                start_str
-            )
+            df = self._load_klines(start_str)
             
-            if not klines:
+            if df.empty:
                 raise ValueError(f"No data found for {self.symbol}")
             
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            
-            # Convert timestamp and set as index
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            
             # Convert from UTC to specified timezone
             if self.timezone != 'UTC':
                 try:
                     utc = pytz.UTC
                     target_tz = pytz.timezone(self.timezone)
-                    df['timestamp'] = df['timestamp'].dt.tz_localize(utc).dt.tz_convert(target_tz)
+                    df = df.set_axis(df.index.tz_localize(utc).tz_convert(target_tz))
                     print(f"Converted timestamps from UTC to {self.timezone}")
                 except Exception as e:
                     print(f"Warning: Could not convert to timezone {self.timezone}, using UTC. Error: {e}")
             
-            df.set_index('timestamp', inplace=True)
-            
-            price_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in price_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            df.rename(columns={
-                'open': 'Open',
-                'high': 'High', 
-                'low': 'Low',
-                'close': 'Close',
-                'volume': 'Volume'
-            }, inplace=True)
-            
+            # A new frame, so the indicator columns never land in the cached one
             self.data = df[['Open', 'High', 'Low', 'Close', 'Volume']]
             print(f"Fetched {len(self.data)} {self.interval} candles for {self.symbol}")
             return self.data
@@ -156,6 +244,104 @@ class InteractiveCryptoMACDStrategy:
             (self.data['Close'] < self.data['EMA_200'])
         )
         
+        # EMA values of the last two bars, the starting point for update_macd_incremental
+        states = [
+            (float(ema_fast.iloc[i]), float(ema_slow.iloc[i]), float(self.data['Signal'].iloc[i]), float(self.data['EMA_200'].iloc[i]))
+            for i in range(-min(2, len(self.data)), 0)
+        ]
+        self._ema_state = states[-1] if states else None
+        self._ema_prev_state = states[-2] if len(states) > 1 else None
+        
+    def update_macd_incremental(self, kline):
+        """
+        Apply one live kline (a raw Binance kline row) to the data and indicators
+        
+        A kline for the last bar replaces it, a newer one appends a bar. Only that
+        bar's EMAs are computed, from the previous bar's values stored by
+        calculate_macd, instead of recomputing the whole history. After a gap of
+        missing bars (or without stored EMAs) everything is recalculated.
+        
+        Returns the bar's values for the chart, or None for a kline older than the last bar.
+        """
+        timestamp = pd.Timestamp(int(kline[0]), unit='ms')
+        if self.data.index.tz is not None:
+            timestamp = timestamp.tz_localize('UTC').tz_convert(self.data.index.tz)
+        open_, high, low, close, volume = (float(value) for value in kline[1:6])
+        
+        last = self.data.index[-1]
+        if timestamp < last:
+            return None
+        new_bar = timestamp > last
+        candle = {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+        
+        if new_bar:
+            gap = len(self.data) > 1 and timestamp - last > last - self.data.index[-2]
+            if gap or self._ema_state is None:
+                self.data = pd.concat([self.data, self._bar_frame(timestamp, candle)])
+                self.calculate_macd()
+                return self._latest_point(new_bar)
+            # The closed bar's EMAs are the base for the new one
+            base = self._ema_state
+        else:
+            if self._ema_prev_state is None:
+                for column, value in candle.items():
+                    self.data.at[timestamp, column] = value
+                self.calculate_macd()
+                return self._latest_point(new_bar)
+            base = self._ema_prev_state
+        
+        source_price = {'high': high, 'low': low, 'open': open_}.get(self.source, close)
+        fast_prev, slow_prev, signal_prev, ema_200_prev = base
+        
+        # ewm(adjust=False) recurrence: ema_t = ema_{t-1} + alpha * (x_t - ema_{t-1})
+        ema_fast = fast_prev + 2 / (self.fast_length + 1) * (source_price - fast_prev)
+        ema_slow = slow_prev + 2 / (self.slow_length + 1) * (source_price - slow_prev)
+        macd = ema_fast - ema_slow
+        signal = signal_prev + 2 / (self.signal_smoothing + 1) * (macd - signal_prev)
+        ema_200 = ema_200_prev + 2 / (200 + 1) * (close - ema_200_prev)
+        macd_prev = fast_prev - slow_prev
+        
+        candle.update({
+            'MACD': macd,
+            'Signal': signal,
+            'Histogram': macd - signal,
+            'EMA_200': ema_200,
+            'MACD_prev': macd_prev,
+            'Signal_prev': signal_prev,
+            'Bullish_Cross': macd > signal and macd_prev <= signal_prev and macd < 0 and signal < 0 and close > ema_200,
+            'Bearish_Cross': macd < signal and macd_prev >= signal_prev and macd > 0 and signal > 0 and close < ema_200
+        })
+        if new_bar:
+            self.data = pd.concat([self.data, self._bar_frame(timestamp, candle)])
+            self._ema_prev_state = self._ema_state
+        else:
+            for column, value in candle.items():
+                self.data.at[timestamp, column] = value
+        self._ema_state = (ema_fast, ema_slow, signal, ema_200)
+        return self._latest_point(new_bar)
+    
+    def _bar_frame(self, timestamp, values):
+        """One-row frame for appending a bar to self.data"""
+        return pd.DataFrame([values], index=pd.DatetimeIndex([timestamp], name=self.data.index.name))
+    
+    def _latest_point(self, new_bar):
+        """Last bar's candle and indicator values, as sent to the dashboard per tick"""
+        bar = self.data.iloc[-1]
+        return {
+            'x': _epoch_ms(self.data.index[-1:])[0],
+            'new_bar': new_bar,
+            'open': float(bar['Open']),
+            'high': float(bar['High']),
+            'low': float(bar['Low']),
+            'close': float(bar['Close']),
+            'ema_200': float(bar['EMA_200']),
+            'macd': float(bar['MACD']),
+            'signal': float(bar['Signal']),
+            'histogram': float(bar['Histogram']),
+            'bullish_cross': bool(bar['Bullish_Cross']),
+            'bearish_cross': bool(bar['Bearish_Cross'])
+        }
+        
     def backtest(self):
         """Run the backtest and track trades"""
         position = None
@@ -295,6 +481,141 @@ class InteractiveCryptoMACDStrategy:
         
         return performance
     
+    def iter_trace_dicts(self, candlestick=None):
+        """
+        Yield the traces of create_interactive_plot as plain, JSON-ready dicts
+        
+        Built straight from the DataFrame columns, without constructing Plotly
+        objects; create_interactive_plot is only needed for standalone HTML.
+        Pass a candlestick dict from an earlier call on the same data to reuse it.
+        """
+        x = _epoch_ms(self.data.index)
+        
+        if candlestick is None:
+            candlestick = {
+                'type': 'candlestick',
+                'x': x,
+                'open': self.data['Open'].to_numpy().tolist(),
+                'high': self.data['High'].to_numpy().tolist(),
+                'low': self.data['Low'].to_numpy().tolist(),
+                'close': self.data['Close'].to_numpy().tolist(),
+                'name': 'Price',
+                'increasing': {'line': {'color': '#00ff88'}, 'fillcolor': '#00ff88'},
+                'decreasing': {'line': {'color': '#ff4976'}, 'fillcolor': '#ff4976'},
+                'xaxis': 'x',
+                'yaxis': 'y'
+            }
+        yield candlestick
+        
+        yield {
+            'type': 'scatter',
+            'x': x,
+            'y': self.data['EMA_200'].to_numpy().tolist(),
+            'mode': 'lines',
+            'name': '200 EMA',
+            'line': {'color': '#FFD700', 'width': 2},
+            'hovertemplate': '<b>200 EMA</b><br>Value: %{y:.6f}<br>Date: %{x}<extra></extra>',
+            'xaxis': 'x',
+            'yaxis': 'y'
+        }
+        
+        entry_points = self.data[self.data['Bullish_Cross']]
+        short_entry_points = self.data[self.data['Bearish_Cross']]
+        signals = [
+            (entry_points, 'triangle-up', '#00ff88', 'Buy Signal'),
+            (short_entry_points, 'diamond', '#42a5f5', 'Short Signal')
+        ]
+        for points, symbol, color, name in signals:
+            if not points.empty:
+                yield {
+                    'type': 'scatter',
+                    'x': _epoch_ms(points.index),
+                    'y': points['Close'].to_numpy().tolist(),
+                    'mode': 'markers',
+                    'marker': {'symbol': symbol, 'size': 15, 'color': color, 'line': {'width': 2, 'color': 'white'}},
+                    'name': name,
+                    'hovertemplate': f'<b>{name}</b><br>Price: %{{y:.6f}}<br>Date: %{{x}}<extra></extra>',
+                    'xaxis': 'x',
+                    'yaxis': 'y'
+                }
+        
+        # Trade exits: profit / loss colors per position (shorts: blue / orange)
+        exits = [
+            ('Long', 'triangle-down', '#00ff88', '#ff4976', 'Close Long'),
+            ('Short', 'x', '#42a5f5', '#ff9800', 'Close Short')
+        ]
+        for position, symbol, win_color, loss_color, name in exits:
+            trades = [t for t in self.trades if t.get('Position') == position]
+            if trades:
+                returns = np.array([t['Return'] for t in trades])
+                yield {
+                    'type': 'scatter',
+                    'x': _epoch_ms([t['Exit Date'] for t in trades]),
+                    'y': [t['Exit Price'] for t in trades],
+                    'mode': 'markers',
+                    'marker': {
+                        'symbol': symbol,
+                        'size': 12,
+                        'color': np.where(returns > 0, win_color, loss_color).tolist(),
+                        'line': {'width': 2, 'color': 'white'}
+                    },
+                    'name': name,
+                    'hovertemplate': f'<b>{name}</b><br>Price: %{{y:.6f}}<br>Return: %{{customdata:.2f}}%<br>Reason: %{{text}}<br>Date: %{{x}}<extra></extra>',
+                    'customdata': (returns * 100).tolist(),
+                    'text': [t['Exit Reason'] for t in trades],
+                    'xaxis': 'x',
+                    'yaxis': 'y'
+                }
+        
+        for column, color in (('MACD', '#2196F3'), ('Signal', '#FF5722')):
+            yield {
+                'type': 'scatter',
+                'x': x,
+                'y': self.data[column].to_numpy().tolist(),
+                'mode': 'lines',
+                'name': column,
+                'line': {'color': color, 'width': 2},
+                'hovertemplate': f'<b>{column}</b><br>Value: %{{y:.8f}}<br>Date: %{{x}}<extra></extra>',
+                'xaxis': 'x2',
+                'yaxis': 'y2'
+            }
+        
+        histogram = self.data['Histogram'].to_numpy()
+        yield {
+            'type': 'bar',
+            'x': x,
+            'y': histogram.tolist(),
+            'name': 'Histogram',
+            'marker': {'color': np.where(histogram >= 0, '#00ff88', '#ff4976').tolist()},
+            'opacity': 0.6,
+            'hovertemplate': '<b>Histogram</b><br>Value: %{y:.8f}<br>Date: %{x}<extra></extra>',
+            'xaxis': 'x2',
+            'yaxis': 'y2'
+        }
+        
+        crosses = [
+            (entry_points, '#00ff88', 'MACD Cross', 'MACD Crossover'),
+            (short_entry_points, '#42a5f5', 'MACD Cross (Bearish)', 'MACD Bearish Crossover')
+        ]
+        for points, color, name, label in crosses:
+            if not points.empty:
+                yield {
+                    'type': 'scatter',
+                    'x': _epoch_ms(points.index),
+                    'y': points['MACD'].to_numpy().tolist(),
+                    'mode': 'markers',
+                    'marker': {'symbol': 'circle', 'size': 8, 'color': color, 'line': {'width': 2, 'color': 'white'}},
+                    'name': name,
+                    'hovertemplate': f'<b>{label}</b><br>MACD: %{{y:.8f}}<br>Date: %{{x}}<extra></extra>',
+                    'showlegend': False,
+                    'xaxis': 'x2',
+                    'yaxis': 'y2'
+                }
+    
+    def get_trace_dicts(self):
+        """Chart traces as a list of plain dicts (see iter_trace_dicts)"""
+        return list(self.iter_trace_dicts())
+    
     def create_interactive_plot(self):
         """Create clean TradingView-style interactive plot with only essential elements"""
         # Create subplots: 2 rows (Price + MACD)
@@ -0,0 +1,13 @@
+"""
+WSGI entry point - Production server for the interactive dashboard
+Runs the dashboard under gunicorn instead of the Flask development server
+
+Usage (from the working directory):
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Each worker process runs its own backtests, so one slow request no longer
+holds up every other session. The strategy caches are per worker; jobs from
+/api/jobs are kept in DASHBOARD_JOB_DIR, so any worker can answer a poll.
+"""
+
+from interactive_dashboard_server import app, socketio
@@ -0,0 +1,18 @@
+"""
+WSGI entry point - Production server for the Trading API
+Runs the API under gunicorn instead of the Flask development server
+
+Usage (from the repository root):
+    gunicorn -k geventwebsocket.gunicorn.workers.GeventWebSocketWorker -w 1 -b 0.0.0.0:5000 wsgi:app
+
+A single gevent worker serves many concurrent requests and WebSocket clients,
+so a slow backtest no longer blocks health checks or data requests. Socket.IO
+needs sticky sessions and a message queue to span several workers; a REST-only
+deployment can raise -w freely.
+"""
+
+from src.api_server import TradingAPI
+
+api = TradingAPI()
+app = api.app
+socketio = api.socketio